@@ -1,206 +1,892 @@
-from collections import deque, defaultdict
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import heapq
+import math
+import os
+import random
+import time
+
+import instrumentacao
+from grafo import GrafoCSR
+
+# Todos os algoritmos trabalham sobre a forma compacta (GrafoCSR) do grafo,
+# com vértices indexados por inteiros; os resultados voltam indexados por nome.
 
 # ========== COMPONENTES CONEXAS ==========
 
 def componentes_conexas(grafo):
-    print("Calculando componentes conexas...")
-    visitado = set()
+    instrumentacao.informar("Calculando componentes conexas...")
+    csr = grafo.para_csr()
+    indptr, indices, nomes = csr.indptr, csr.indices, csr.nomes
+    visitado = bytearray(csr.n)
     componentes = []
-    total, cont = len(grafo.vertices), 0
-
-    for v in grafo.vertices:
-        cont += 1
-        print(f"Componentes conexas: {cont}/{total} vértices processados...", end='\r', flush=True)
-        if v not in visitado:
-            componente = []
-            pilha = [v]
-            while pilha:
-                atual = pilha.pop()
-                if atual not in visitado:
-                    visitado.add(atual)
-                    componente.append(atual)
-                    for vizinho, _ in grafo.lista_adj.get(atual, []):
-                        if vizinho not in visitado:
+    total = csr.n
+
+    with instrumentacao.fase("componentes_conexas"):
+        for v in range(total):
+            instrumentacao.progresso("Componentes conexas", v + 1, total)
+            if not visitado[v]:
+                componente = []
+                pilha = [v]
+                visitado[v] = 1
+                while pilha:
+                    atual = pilha.pop()
+                    componente.append(nomes[atual])
+                    for vizinho in indices[indptr[atual]:indptr[atual + 1]]:
+                        if not visitado[vizinho]:
+                            visitado[vizinho] = 1
                             pilha.append(vizinho)
-            componentes.append(componente)
+                componentes.append(componente)
 
-    print(" " * 50, end='\r')
-    print(f"Componentes conexas calculadas: {len(componentes)} componentes encontradas.")
+    # Cada vértice é desempilhado uma vez, então toda aresta é examinada uma vez
+    instrumentacao.contar("componentes.arestas_relaxadas", indptr[total] if total else 0)
+    instrumentacao.informar(f"Componentes conexas calculadas: {len(componentes)} componentes encontradas.")
     return componentes
 
+def _tarjan_iterativo(csr):
+    """
+    Tarjan com pilha explícita (sem recursão), em O(V + E) e sem grafo transposto.
+
+    Returns:
+        tuple: (rotulo, tamanhos), com rotulo[v] = id da componente de v e
+        tamanhos[c] = ordem da componente c. Os ids saem em ordem topológica
+        reversa da condensação (toda aresta entre componentes vai de id maior para menor).
+    """
+    n, indptr, indices = csr.n, csr.indptr, csr.indices
+    ordem = [-1] * n          # Ordem de descoberta
+    baixo = [0] * n           # Menor ordem alcançável pela subárvore
+    na_pilha = bytearray(n)
+    rotulo = [-1] * n
+    tamanhos = []
+    pilha, contador = [], 0
+
+    for raiz in range(n):
+        instrumentacao.progresso("Componentes fortemente conexas", raiz + 1, n)
+        if ordem[raiz] != -1:
+            continue
+        ordem[raiz] = baixo[raiz] = contador
+        contador += 1
+        pilha.append(raiz)
+        na_pilha[raiz] = 1
+        chamadas = [(raiz, indptr[raiz])]   # (vértice, próxima aresta a examinar)
+
+        while chamadas:
+            v, k = chamadas[-1]
+            fim = indptr[v + 1]
+            while k < fim:
+                w = indices[k]
+                k += 1
+                if ordem[w] == -1:
+                    # "Chamada recursiva": guarda onde parou e desce para w
+                    chamadas[-1] = (v, k)
+                    ordem[w] = baixo[w] = contador
+                    contador += 1
+                    pilha.append(w)
+                    na_pilha[w] = 1
+                    chamadas.append((w, indptr[w]))
+                    break
+                if na_pilha[w] and ordem[w] < baixo[v]:
+                    baixo[v] = ordem[w]
+            else:
+                # Todas as arestas de v examinadas: "retorno" da chamada
+                chamadas.pop()
+                if baixo[v] == ordem[v]:
+                    c, tamanho = len(tamanhos), 0
+                    while True:
+                        w = pilha.pop()
+                        na_pilha[w] = 0
+                        rotulo[w] = c
+                        tamanho += 1
+                        if w == v:
+                            break
+                    tamanhos.append(tamanho)
+                if chamadas:
+                    u = chamadas[-1][0]
+                    if baixo[v] < baixo[u]:
+                        baixo[u] = baixo[v]
+
+    instrumentacao.limpar_linha()
+    instrumentacao.contar("tarjan.arestas_relaxadas", indptr[n] if n else 0)
+    return rotulo, tamanhos
+
+
 def componentes_fortemente_conexas(grafo):
-    print("Calculando componentes fortemente conexas...")
-
-    def dfs(v, visitado, pilha):
-        visitado.add(v)
-        for viz, _ in grafo.lista_adj.get(v, []):
-            if viz not in visitado:
-                dfs(viz, visitado, pilha)
-        pilha.append(v)
-
-    def dfs_transposto(v, visitado, componente, transposto):
-        visitado.add(v)
-        componente.append(v)
-        for viz, _ in transposto.get(v, []):
-            if viz not in visitado:
-                dfs_transposto(viz, visitado, componente, transposto)
-
-    visitado, pilha = set(), []
-    total, cont = len(grafo.vertices), 0
-
-    for v in grafo.vertices:
-        cont += 1
-        print(f"Passo 1 - DFS direto: {cont}/{total} vértices processados...", end='\r', flush=True)
-        if v not in visitado:
-            dfs(v, visitado, pilha)
-
-    print(" " * 50, end='\r')
-
-    transposto = defaultdict(list)
-    for u in grafo.lista_adj:
-        for v, peso in grafo.lista_adj[u]:
-            transposto[v].append((u, peso))
-
-    visitado.clear()
-    componentes = []
-    while pilha:
-        v = pilha.pop()
-        if v not in visitado:
-            componente = []
-            dfs_transposto(v, visitado, componente, transposto)
-            componentes.append(componente)
-
-    print(f"Componentes fortemente conexas calculadas: {len(componentes)} componentes encontradas.")
+    instrumentacao.informar("Calculando componentes fortemente conexas...")
+    csr = grafo.para_csr()
+    rotulo, tamanhos = _tarjan_iterativo(csr)
+
+    componentes = [[] for _ in tamanhos]
+    for v, c in enumerate(rotulo):
+        componentes[c].append(csr.nomes[v])
+
+    instrumentacao.informar(f"Componentes fortemente conexas calculadas: {len(componentes)} componentes encontradas.")
     return componentes
 
+
+def condensacao_scc(grafo):
+    """
+    Componentes fortemente conexas e o DAG de condensação, em uma passada de
+    Tarjan mais uma passada pelas arestas.
+
+    Returns:
+        tuple: (rotulos, tamanhos, arestas_dag)
+        - rotulos: dict nome -> id da componente;
+        - tamanhos: lista com a ordem de cada componente (indexada pelo id);
+        - arestas_dag: conjunto de pares (c1, c2) de componentes distintas ligadas
+          por ao menos uma aresta. Os ids estão em ordem topológica reversa.
+    """
+    instrumentacao.informar("Calculando componentes fortemente conexas e condensação...")
+    csr = grafo.para_csr()
+    indptr, indices = csr.indptr, csr.indices
+    rotulo, tamanhos = _tarjan_iterativo(csr)
+
+    arestas_dag = set()
+    for u in range(csr.n):
+        cu = rotulo[u]
+        for w in indices[indptr[u]:indptr[u + 1]]:
+            if rotulo[w] != cu:
+                arestas_dag.add((cu, rotulo[w]))
+
+    instrumentacao.informar(f"Componentes fortemente conexas calculadas: {len(tamanhos)} componentes, "
+                            f"{len(arestas_dag)} arestas na condensação.")
+    return dict(zip(csr.nomes, rotulo)), tamanhos, arestas_dag
+
+
+def distribuicao_ordens(tamanhos):
+    """Distribuição da ordem das componentes: lista de (ordem, quantidade), da maior ordem para a menor."""
+    return sorted(Counter(tamanhos).items(), reverse=True)
+
 # ========== ÁRVORE GERADORA MÍNIMA ==========
 
 def agm_prim(grafo, inicio):
-    print(f"Calculando Árvore Geradora Mínima a partir do vértice '{inicio}'...")
-    visitado, agm, custo_total = set(), [], 0
+    instrumentacao.informar(f"Calculando Árvore Geradora Mínima a partir do vértice '{inicio}'...")
+    csr = grafo.para_csr()
+    indptr, indices, pesos, nomes = csr.indptr, csr.indices, csr.pesos, csr.nomes
+    agm, custo_total = [], 0
     fila = []
 
-    visitado.add(inicio)
-    for viz, peso in grafo.lista_adj.get(inicio, []):
-        heapq.heappush(fila, (peso, inicio, viz))
+    raiz = csr.indice.get(inicio)
+    if raiz is None:
+        instrumentacao.informar(f"AGM calculada com custo total: {custo_total}")
+        return agm, custo_total
+
+    visitado = bytearray(csr.n)
+    visitado[raiz] = 1
+    for k in range(indptr[raiz], indptr[raiz + 1]):
+        heapq.heappush(fila, (pesos[k], raiz, indices[k]))
 
     while fila:
         peso, u, v = heapq.heappop(fila)
-        if v not in visitado:
-            visitado.add(v)
-            agm.append((u, v, peso))
+        if not visitado[v]:
+            visitado[v] = 1
+            agm.append((nomes[u], nomes[v], peso))
+            custo_total += peso
+            for k in range(indptr[v], indptr[v + 1]):
+                viz = indices[k]
+                if not visitado[viz]:
+                    heapq.heappush(fila, (pesos[k], v, viz))
+
+    instrumentacao.informar(f"AGM calculada com custo total: {custo_total}")
+    return agm, custo_total
+
+class UniaoBusca:
+    """Union-find com compressão de caminho (por divisão pela metade) e união por tamanho."""
+    def __init__(self, n):
+        self.pai = list(range(n))
+        self.tamanho = [1] * n
+
+    def adicionar(self):
+        """Cria um novo conjunto unitário e retorna o seu elemento."""
+        self.pai.append(len(self.pai))
+        self.tamanho.append(1)
+        return len(self.pai) - 1
+
+    def encontrar(self, v):
+        pai = self.pai
+        while pai[v] != v:
+            pai[v] = pai[pai[v]]
+            v = pai[v]
+        return v
+
+    def unir(self, u, v):
+        """Une os conjuntos de u e v; retorna False se já estavam no mesmo conjunto."""
+        ru, rv = self.encontrar(u), self.encontrar(v)
+        if ru == rv:
+            return False
+        if self.tamanho[ru] < self.tamanho[rv]:
+            ru, rv = rv, ru
+        self.pai[rv] = ru
+        self.tamanho[ru] += self.tamanho[rv]
+        return True
+
+
+def floresta_geradora_minima(grafo):
+    """
+    Floresta geradora mínima de todo o grafo não direcionado (Kruskal com
+    union-find sobre o vetor de arestas ordenado por peso).
+
+    Returns:
+        tuple: (arvores, custos, componente)
+        - arvores: lista, por componente, das arestas (u, v, peso) da sua AGM;
+        - custos: custo total da AGM de cada componente;
+        - componente: dict nome -> índice da componente (em arvores/custos).
+    """
+    csr = grafo.para_csr()
+    if csr.direcionado:
+        raise ValueError("A floresta geradora mínima é definida para grafos não direcionados")
+    instrumentacao.informar("Calculando floresta geradora mínima (Kruskal)...")
+    indptr, indices, pesos, nomes = csr.indptr, csr.indices, csr.pesos, csr.nomes
+    n = csr.n
+
+    # Cada aresta uma vez (u < v), em vetores paralelos, ordenados por peso
+    origens, destinos, pesos_arestas = array('i'), array('i'), []
+    for u in range(n):
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if u < v:
+                origens.append(u)
+                destinos.append(v)
+                pesos_arestas.append(pesos[k])
+    with instrumentacao.fase("kruskal"):
+        ordem = sorted(range(len(pesos_arestas)), key=pesos_arestas.__getitem__)
+
+        uf = UniaoBusca(n)
+        escolhidas, restantes, examinadas = [], n - 1, 0
+        for examinadas, e in enumerate(ordem, 1):
+            if uf.unir(origens[e], destinos[e]):
+                escolhidas.append(e)
+                restantes -= 1
+                if restantes == 0:
+                    break
+    instrumentacao.contar("kruskal.arestas_examinadas", examinadas)
+
+    componente_da_raiz, componente = {}, {}
+    for v in range(n):
+        componente[nomes[v]] = componente_da_raiz.setdefault(uf.encontrar(v), len(componente_da_raiz))
+
+    arvores = [[] for _ in componente_da_raiz]
+    custos = [0] * len(componente_da_raiz)
+    for e in escolhidas:
+        u, v, peso = origens[e], destinos[e], pesos_arestas[e]
+        c = componente_da_raiz[uf.encontrar(u)]
+        arvores[c].append((nomes[u], nomes[v], peso))
+        custos[c] += peso
+
+    instrumentacao.informar(f"Floresta geradora mínima calculada: {len(arvores)} componentes, custo total {sum(custos)}")
+    return arvores, custos, componente
+
+
+def agm_da_floresta(floresta, raiz):
+    """AGM (arestas, custo) da componente de `raiz`, consultada na floresta já calculada."""
+    arvores, custos, componente = floresta
+    c = componente.get(raiz)
+    if c is None:
+        return [], 0
+    return arvores[c], custos[c]
+
+
+class _HeapIndexado:
+    """Heap binário de mínimo sobre ids 0..n-1, com diminuição de chave em O(log n)."""
+    def __init__(self, n):
+        self.heap = []              # ids
+        self.chave = {}             # id -> chave atual
+        self.posicao = [-1] * n     # id -> posição no heap (-1: fora)
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    def inserir_ou_diminuir(self, v, chave):
+        """Insere v ou diminui sua chave; retorna False se a chave atual já for menor ou igual."""
+        if self.posicao[v] >= 0:
+            if chave >= self.chave[v]:
+                return False
+            self.chave[v] = chave
+            self._subir(self.posicao[v])
+        else:
+            self.chave[v] = chave
+            self.heap.append(v)
+            self.posicao[v] = len(self.heap) - 1
+            self._subir(len(self.heap) - 1)
+        return True
+
+    def extrair(self):
+        heap, posicao = self.heap, self.posicao
+        v = heap[0]
+        ultimo = heap.pop()
+        posicao[v] = -1
+        if heap:
+            heap[0] = ultimo
+            posicao[ultimo] = 0
+            self._descer(0)
+        return v, self.chave.pop(v)
+
+    def _subir(self, i):
+        heap, posicao, chave = self.heap, self.posicao, self.chave
+        v = heap[i]
+        while i > 0:
+            p = (i - 1) >> 1
+            if chave[heap[p]] <= chave[v]:
+                break
+            heap[i] = heap[p]
+            posicao[heap[i]] = i
+            i = p
+        heap[i] = v
+        posicao[v] = i
+
+    def _descer(self, i):
+        heap, posicao, chave = self.heap, self.posicao, self.chave
+        n, v = len(heap), heap[i]
+        while True:
+            f = 2 * i + 1
+            if f >= n:
+                break
+            if f + 1 < n and chave[heap[f + 1]] < chave[heap[f]]:
+                f += 1
+            if chave[heap[f]] >= chave[v]:
+                break
+            heap[i] = heap[f]
+            posicao[heap[i]] = i
+            i = f
+        heap[i] = v
+        posicao[v] = i
+
+
+def agm_prim_indexado(grafo, inicio):
+    """
+    Prim com heap indexado (diminuição de chave): cada vértice fica no heap no
+    máximo uma vez, então o heap tem O(V) entradas em vez de O(E).
+    Mesmo retorno de agm_prim.
+    """
+    instrumentacao.informar(f"Calculando Árvore Geradora Mínima (heap indexado) a partir do vértice '{inicio}'...")
+    csr = grafo.para_csr()
+    indptr, indices, pesos, nomes = csr.indptr, csr.indices, csr.pesos, csr.nomes
+    agm, custo_total = [], 0
+
+    raiz = csr.indice.get(inicio)
+    if raiz is None:
+        instrumentacao.informar(f"AGM calculada com custo total: {custo_total}")
+        return agm, custo_total
+
+    na_arvore = bytearray(csr.n)
+    pai = {}
+    heap = _HeapIndexado(csr.n)
+    heap.inserir_ou_diminuir(raiz, 0)
+
+    while heap:
+        v, peso = heap.extrair()
+        na_arvore[v] = 1
+        if v != raiz:
+            agm.append((nomes[pai[v]], nomes[v], peso))
             custo_total += peso
-            for viz, p in grafo.lista_adj.get(v, []):
-                if viz not in visitado:
-                    heapq.heappush(fila, (p, v, viz))
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            if not na_arvore[w] and heap.inserir_ou_diminuir(w, pesos[k]):
+                pai[w] = v
 
-    print(f"AGM calculada com custo total: {custo_total}")
+    instrumentacao.informar(f"AGM calculada com custo total: {custo_total}")
     return agm, custo_total
 
 # ========== CENTRALIDADE DE GRAU ==========
 def degree_centrality(grafo, mode="total", normalizar=False):
+    csr = grafo.para_csr()
+    indptr, nomes = csr.indptr, csr.nomes
     centralidade = {}
-    total, cont = len(grafo.vertices), 0
-    n = len(grafo.vertices)
+    n = total = csr.n
 
-    for v in grafo.vertices:
-        cont += 1
-        print(f"Centralidade de grau: {cont}/{total} vértices processados...", end='\r', flush=True)
+    # Grau de entrada: vem da adjacência reversa (transposta), montada uma vez em O(V + E)
+    if csr.direcionado and mode != "out":
+        grau_entrada = csr.graus_entrada()
 
-        if grafo.direcionado:
+    for v in range(n):
+        instrumentacao.progresso("Centralidade de grau", v + 1, total)
+
+        grau_saida = indptr[v + 1] - indptr[v]
+        if csr.direcionado:
             if mode == "in":
-                grau = sum(1 for u in grafo.vertices for w, _ in grafo.lista_adj.get(u, []) if w == v)
+                grau = grau_entrada[v]
             elif mode == "out":
-                grau = len(grafo.lista_adj.get(v, []))
+                grau = grau_saida
             else:
-                in_degree = sum(1 for u in grafo.vertices for w, _ in grafo.lista_adj.get(u, []) if w == v)
-                out_degree = len(grafo.lista_adj.get(v, []))
-                grau = in_degree + out_degree
+                grau = grau_entrada[v] + grau_saida
         else:
-            grau = len(grafo.lista_adj.get(v, []))
+            grau = grau_saida
 
         norm = grau / (n - 1) if normalizar and n > 1 else grau
-        centralidade[v] = (grau, norm)
+        centralidade[nomes[v]] = (grau, norm)
 
-    print(" " * 50, end='\r')
+    instrumentacao.limpar_linha()
     return centralidade
 
 
-def betweenness_centrality(grafo, normalizar=False):
-    centralidade = defaultdict(float)
-    total, cont = len(grafo.vertices), 0
-    n = len(grafo.vertices)
+# Fontes por bloco de trabalho do Brandes. O particionamento é fixo (não depende do
+# número de processos) e os parciais são somados na ordem dos blocos, de modo que os
+# resultados paralelo e serial são idênticos.
+FONTES_POR_BLOCO = 256
+
 
-    for s in grafo.vertices:
-        cont += 1
-        print(f"Betweenness: {cont}/{total} vértices processados...", end='\r', flush=True)
+def _brandes_fontes(n, indptr, indices, fontes, quadrados=False, distancias=False, pesos=None):
+    """
+    Soma das dependências de Brandes (por id) considerando apenas as fontes dadas.
+    Retorna (soma, soma_dos_quadrados, distancias, metricas): a segunda apenas se
+    quadrados=True; a terceira, se distancias=True, é a lista de
+    (alcançados, soma das distâncias) de cada fonte, aproveitando a mesma BFS
+    para a centralidade de proximidade. metricas = (arestas relaxadas na BFS,
+    segundos de BFS, segundos de acumulação), somadas em todas as fontes.
+    Com `pesos` (por id), cada vértice conta como pesos[v] vértices: o par (s, t)
+    soma pesos[s] * pesos[t] vezes (redução por blocos biconexos).
+    """
+    centralidade = [0.0] * n
+    centralidade2 = [0.0] * n if quadrados else None
+    somas_dist = [] if distancias else None
+    relaxadas, tempo_bfs, tempo_acumulacao = 0, 0.0, 0.0
+    relogio = time.perf_counter
 
-        S, P = [], defaultdict(list)
-        sigma = dict.fromkeys(grafo.vertices, 0)
-        d = dict.fromkeys(grafo.vertices, -1)
+    for s in fontes:
+        inicio = relogio()
+        S = []
+        sigma = [0] * n
+        d = [-1] * n
         sigma[s], d[s] = 1, 0
         Q = deque([s])
 
         while Q:
             v = Q.popleft()
             S.append(v)
-            for w, _ in grafo.lista_adj.get(v, []):
+            dv = d[v] + 1
+            a, b = indptr[v], indptr[v + 1]
+            relaxadas += b - a
+            for w in indices[a:b]:
                 if d[w] < 0:
                     Q.append(w)
-                    d[w] = d[v] + 1
-                if d[w] == d[v] + 1:
+                    d[w] = dv
+                if d[w] == dv:
                     sigma[w] += sigma[v]
-                    P[w].append(v)
 
-        delta = dict.fromkeys(grafo.vertices, 0)
-        while S:
-            w = S.pop()
-            for v in P[w]:
-                if sigma[w] != 0:
-                    delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
-            if w != s:
-                centralidade[w] += delta[w]
+        if distancias:
+            somas_dist.append((len(S) - 1, sum(d[v] for v in S)))
+        meio = relogio()
+        tempo_bfs += meio - inicio
+
+        # Acumulação percorrendo os sucessores de cada vértice na DAG de caminhos mínimos
+        delta = [0.0] * n
+        if pesos is None:
+            while S:
+                v = S.pop()
+                dv = d[v] + 1
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if d[w] == dv:
+                        delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
+                if v != s:
+                    centralidade[v] += delta[v]
+                    if quadrados:
+                        centralidade2[v] += delta[v] * delta[v]
+        else:
+            # Laço separado para não pagar a consulta aos pesos no caso comum
+            peso_fonte = pesos[s]
+            while S:
+                v = S.pop()
+                dv = d[v] + 1
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if d[w] == dv:
+                        delta[v] += (sigma[v] / sigma[w]) * (pesos[w] + delta[w])
+                if v != s:
+                    centralidade[v] += peso_fonte * delta[v]
+        tempo_acumulacao += relogio() - meio
+
+    return centralidade, centralidade2, somas_dist, (relaxadas, tempo_bfs, tempo_acumulacao)
+
+
+# Grafo (somente leitura) de cada processo trabalhador, recebido uma única vez na inicialização
+_grafo_trabalhador = None
+
+def _iniciar_trabalhador(n, indptr, indices):
+    global _grafo_trabalhador
+    _grafo_trabalhador = (n, indptr, indices)
+
+def _brandes_bloco(fontes, quadrados=False, distancias=False):
+    return _brandes_fontes(*_grafo_trabalhador, fontes, quadrados, distancias)
+
+
+def _criar_executor(csr, workers):
+    """Pool de processos com o grafo já carregado em cada trabalhador (None se workers <= 1)."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_trabalhador,
+                               initargs=(csr.n, _serializavel(csr.indptr), _serializavel(csr.indices)))
+
+
+def _serializavel(arr):
+    """Um grafo aberto do cache usa memoryview (não serializável): copia para um array."""
+    return array(arr.format, arr.tobytes()) if isinstance(arr, memoryview) else arr
 
-    print(" " * 50, end='\r')
 
-    for v in centralidade:
-        centralidade[v] /= 2
+def _somar_dependencias(csr, fontes, executor=None, quadrados=False, distancias=False):
+    """
+    Soma as dependências de Brandes das fontes dadas, em blocos de FONTES_POR_BLOCO,
+    no executor (se houver) ou no próprio processo.
+    Retorna (soma, soma_dos_quadrados, distancias), como _brandes_fontes.
+    """
+    n = csr.n
+    blocos = [fontes[i:i + FONTES_POR_BLOCO] for i in range(0, len(fontes), FONTES_POR_BLOCO)]
 
+    if executor is not None and len(blocos) > 1:
+        parciais = executor.map(_brandes_bloco, blocos, repeat(quadrados), repeat(distancias))
+    else:
+        parciais = (_brandes_fontes(n, csr.indptr, csr.indices, bloco, quadrados, distancias)
+                    for bloco in blocos)
+
+    soma = [0.0] * n
+    soma2 = [0.0] * n if quadrados else None
+    somas_dist = [] if distancias else None
+    feitos = 0
+    with instrumentacao.fase("brandes"):
+        for bloco, (parcial, parcial2, parcial_dist, metricas) in zip(blocos, parciais):
+            feitos += len(bloco)
+            instrumentacao.progresso("Betweenness", feitos, len(fontes))
+            for v, valor in enumerate(parcial):
+                soma[v] += valor
+            if quadrados:
+                for v, valor in enumerate(parcial2):
+                    soma2[v] += valor
+            if distancias:
+                somas_dist.extend(parcial_dist)
+
+            # Tempos somados entre os trabalhadores (tempo de CPU, não de relógio)
+            relaxadas, tempo_bfs, tempo_acumulacao = metricas
+            instrumentacao.contar("brandes.fontes", len(bloco))
+            instrumentacao.contar("brandes.arestas_relaxadas", relaxadas)
+            instrumentacao.contar("brandes.segundos_bfs", tempo_bfs)
+            instrumentacao.contar("brandes.segundos_acumulacao", tempo_acumulacao)
+
+    instrumentacao.limpar_linha()
+    return soma, soma2, somas_dist
+
+
+def _fator_normalizacao(n, direcionado):
+    return (1 / ((n - 1) * (n - 2))) if direcionado else (2 / ((n - 1) * (n - 2)))
+
+
+def _montar_betweenness(csr, centralidade, normalizar):
+    """Converte a soma das dependências (por id) no dicionário nome -> (valor, normalizado)."""
+    n, nomes = csr.n, csr.nomes
     resultado = {}
-    for v, valor in centralidade.items():
+    for v in range(n):
+        valor = centralidade[v] / 2
         if normalizar and n > 2:
-            norm = (1 / ((n - 1) * (n - 2))) if grafo.direcionado else (2 / ((n - 1) * (n - 2)))
-            resultado[v] = (valor, valor * norm)
+            resultado[nomes[v]] = (valor, valor * _fator_normalizacao(n, csr.direcionado))
         else:
-            resultado[v] = (valor, valor)
-
+            resultado[nomes[v]] = (valor, valor)
     return resultado
 
 
-def closeness_centrality(grafo, normalizar=False, vertices=None):
-    from collections import deque
-    centralidade = {}
-    n = len(grafo.vertices)
-    if vertices is None:
-        vertices = grafo.vertices
+def betweenness_centrality(grafo, normalizar=False, workers=1, amostras=None, epsilon=None,
+                           delta=0.1, semente=None, reducao=False):
+    """
+    Betweenness exata (Brandes). Com workers > 1, os blocos de fontes são
+    distribuídos entre processos e os parciais somados ao final.
+
+    Com `reducao`, grafos não direcionados usam betweenness_por_blocos (mesmo
+    resultado, BFS só nos blocos biconexos com três ou mais vértices).
+
+    Se `amostras` ou `epsilon` for informado, usa a versão aproximada
+    (betweenness_aproximada) e exibe o erro estimado.
+    """
+    if amostras is not None or epsilon is not None:
+        resultado, (erro, erro_norm) = betweenness_aproximada(
+            grafo, amostras=amostras, epsilon=epsilon, delta=delta, normalizar=normalizar,
+            semente=semente, workers=workers)
+        instrumentacao.informar(f"Betweenness aproximada: erro máximo estimado {erro:.4f} "
+                                f"(normalizado: {erro_norm:.4f}) com probabilidade {1 - delta:.0%}")
+        return resultado
+
+    csr = grafo.para_csr()
+    if reducao and not csr.direcionado:
+        return betweenness_por_blocos(grafo, normalizar, workers)
+
+    executor = _criar_executor(csr, workers)
+    try:
+        centralidade, _, _ = _somar_dependencias(csr, range(csr.n), executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return _montar_betweenness(csr, centralidade, normalizar)
+
+def betweenness_e_closeness(grafo, normalizar=False, workers=1, reducao=False):
+    """
+    Calcula betweenness e closeness de todos os vértices reaproveitando a BFS de
+    Brandes de cada fonte para as somas de distâncias da proximidade. Com
+    `reducao`, grafos não direcionados reaproveitam a mesma redução em blocos.
+
+    Returns:
+        tuple: (betweenness, closeness), nos formatos de betweenness_centrality e
+        closeness_centrality (com o mesmo `normalizar`).
+    """
+    csr = grafo.para_csr()
+    n = csr.n
+    if reducao and not csr.direcionado:
+        blocos = _reduzir_em_blocos(csr)
+        centralidade = _betweenness_blocos(csr, blocos, workers)
+        somas_dist = _somas_distancias_blocos(csr, blocos)
+    else:
+        executor = _criar_executor(csr, workers)
+        try:
+            centralidade, _, somas_dist = _somar_dependencias(csr, range(n), executor, distancias=True)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    closeness = {}
+    for v, (reachable, total_dist) in zip(csr.nomes, somas_dist):
+        if reachable > 0 and total_dist > 0:
+            valor = reachable / total_dist
+            closeness[v] = (valor, valor * (n - 1) if normalizar and n > 1 else valor)
+        else:
+            closeness[v] = (0.0, 0.0)
+
+    return _montar_betweenness(csr, centralidade, normalizar), closeness
+
+# ========== BETWEENNESS APROXIMADA ==========
+
+def _limite_erro(soma, soma2, k, n, delta):
+    """
+    Limite (com probabilidade >= 1 - delta) para o desvio máximo, entre todos os
+    vértices, da soma extrapolada n/k * soma em relação à soma exata das dependências.
+
+    Cada dependência δ_s(v) está em [0, n - 2]; usa o menor entre o limite de
+    Hoeffding e o de Bernstein empírico (Maurer e Pontil), ambos com união sobre
+    os n vértices.
+    """
+    if k >= n:
+        return 0.0
+    escala = n - 2
+    log_termo = math.log(4 * n / delta)
+    t = math.sqrt(log_termo / (2 * k))
+    if k > 1:
+        maior_var = 0.0
+        for v in range(n):
+            media = soma[v] / escala / k
+            var = (soma2[v] / (escala * escala) - k * media * media) / (k - 1)
+            if var > maior_var:
+                maior_var = var
+        t = min(t, math.sqrt(2 * maior_var * log_termo / k) + 7 * log_termo / (3 * (k - 1)))
+    return n * escala * t
+
+
+def _rodadas_amostragem(csr, executor, semente, delta, lote, dobrar):
+    """
+    Sorteia fontes sem reposição em rodadas e gera, após cada rodada,
+    (k, estimativa, erro): a soma extrapolada das dependências por id e o limite
+    de erro dessa soma. A rodada r usa delta / 2**r, de modo que os limites valem
+    simultaneamente para todas as rodadas com probabilidade >= 1 - delta.
+    """
+    n = csr.n
+    ordem = list(range(n))
+    random.Random(semente).shuffle(ordem)
+
+    soma, soma2 = [0.0] * n, [0.0] * n
+    k = rodada = 0
+    while k < n:
+        fontes = ordem[k:k + lote]
+        parcial, parcial2, _ = _somar_dependencias(csr, fontes, executor, quadrados=True)
+        for v in range(n):
+            soma[v] += parcial[v]
+            soma2[v] += parcial2[v]
+        k += len(fontes)
+        rodada += 1
+
+        erro = _limite_erro(soma, soma2, k, n, delta / 2 ** rodada)
+        yield k, [valor * n / k for valor in soma], erro
+        if dobrar:
+            lote = k
+
+
+def betweenness_aproximada(grafo, amostras=None, epsilon=None, delta=0.1, normalizar=False,
+                           semente=None, workers=1):
+    """
+    Betweenness aproximada por amostragem de fontes (pivôs): roda Brandes só a
+    partir das fontes sorteadas e extrapola as somas por n/k.
+
+    Com `amostras=k`, usa exatamente k fontes. Com `epsilon`, sorteia em rodadas
+    de tamanho dobrado até que o erro máximo na escala normalizada seja <= epsilon
+    com probabilidade >= 1 - delta (no pior caso, todas as fontes: resultado exato).
+
+    Returns:
+        tuple: (resultado, erro). resultado tem o formato de betweenness_centrality;
+        erro = (erro, erro_normalizado) é o limite para o desvio máximo em relação ao
+        valor exato, válido com probabilidade >= 1 - delta.
+    """
+    if amostras is None and epsilon is None:
+        raise ValueError("Informe 'amostras' ou 'epsilon'")
+
+    csr = grafo.para_csr()
+    n = csr.n
+    if n <= 2:
+        return betweenness_centrality(grafo, normalizar), (0.0, 0.0)
+    fator = _fator_normalizacao(n, csr.direcionado)
+
+    executor = _criar_executor(csr, workers)
+    try:
+        if amostras is not None:
+            lote, dobrar = min(amostras, n), False
+        else:
+            lote, dobrar = min(FONTES_POR_BLOCO, n), True
+        for k, estimativa, erro in _rodadas_amostragem(csr, executor, semente, delta, lote, dobrar):
+            if amostras is not None or erro / 2 * fator <= epsilon:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    instrumentacao.informar(f"Betweenness aproximada com {k} de {n} fontes.")
+    erro /= 2
+    return _montar_betweenness(csr, estimativa, normalizar), (erro, erro * fator)
+
+
+def betweenness_top_k(grafo, k=10, normalizar=False, delta=0.1, rodadas_estaveis=3,
+                      tamanho_rodada=64, semente=None, workers=1):
+    """
+    Estima os k vértices de maior betweenness, sorteando fontes em rodadas até
+    que o conjunto dos k primeiros se repita por `rodadas_estaveis` rodadas seguidas,
+    ou até que o k-ésimo esteja separado do (k+1)-ésimo por mais que o erro.
+
+    Returns:
+        tuple: (top, erro). top é a lista [(nome, (valor, normalizado))] em ordem
+        decrescente e erro = (erro, erro_normalizado), como em betweenness_aproximada.
+    """
+    csr = grafo.para_csr()
+    n, nomes = csr.n, csr.nomes
+    if n == 0:
+        return [], (0.0, 0.0)
+    fator = _fator_normalizacao(n, csr.direcionado) if n > 2 else 1.0
+
+    executor = _criar_executor(csr, workers)
+    ranking_anterior, estaveis = None, 0
+    try:
+        for amostradas, estimativa, erro in _rodadas_amostragem(
+                csr, executor, semente, delta, min(tamanho_rodada, n), False):
+            ordem = heapq.nlargest(k + 1, range(n), key=lambda v: (estimativa[v], nomes[v]))
+            ranking = ordem[:k]
+            estaveis = estaveis + 1 if set(ranking) == ranking_anterior else 0
+            ranking_anterior = set(ranking)
+
+            separado = len(ordem) > k and estimativa[ordem[k - 1]] - estimativa[ordem[k]] > 2 * erro
+            if estaveis + 1 >= rodadas_estaveis or separado:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    instrumentacao.informar(f"Top-{k} de betweenness estável com {amostradas} de {n} fontes.")
+    resultado = _montar_betweenness(csr, estimativa, normalizar)
+    erro /= 2
+    return [(nomes[v], resultado[nomes[v]]) for v in ranking], (erro, erro * fator)
+
+
+# ========== CENTRALIDADE DE PROXIMIDADE ==========
+
+def _msbfs_lote(csr, fontes, pesos=None):
+    """
+    BFS simultânea a partir de várias fontes (multi-source BFS bit-paralela).
+
+    Cada vértice guarda em um inteiro a máscara das fontes que já o alcançaram
+    (bit j = fontes[j]); a fronteira de cada nível é expandida uma única vez para
+    todas as fontes. As contagens por fonte de cada nível são somadas em um
+    contador "fatiado por bits" (plano i = bit i da contagem de cada fonte).
+    Com `pesos` (inteiros, por id), cada vértice alcançado conta pesos[w] vezes.
+
+    Returns:
+        tuple: (alcancados, soma_dist, soma_inversos) por fonte.
+    """
+    indptr, indices = csr.indptr, csr.indices
+    b = len(fontes)
+    visto = [0] * csr.n
+    fronteira = {}
+    for j, s in enumerate(fontes):
+        visto[s] |= 1 << j
+        fronteira[s] = fronteira.get(s, 0) | (1 << j)
+
+    alcancados, soma_dist, soma_inversos = [0] * b, [0] * b, [0.0] * b
+    nivel = relaxadas = 0
+    while fronteira:
+        nivel += 1
+        proxima = {}
+        for v, mascara in fronteira.items():
+            a, c = indptr[v], indptr[v + 1]
+            relaxadas += c - a
+            for w in indices[a:c]:
+                novos = mascara & ~visto[w]
+                if novos:
+                    visto[w] |= novos
+                    proxima[w] = proxima.get(w, 0) | novos
+        instrumentacao.contar("msbfs.vertices_fronteira", len(proxima))
+        instrumentacao.registrar_maximo("msbfs.maior_fronteira", len(proxima))
+
+        # Soma, fonte a fonte, quantos vértices foram alcançados neste nível
+        planos = []
+        for w, mascara in proxima.items():
+            peso = 1 if pesos is None else pesos[w]
+            base = 0
+            while peso:
+                # Soma mascara * 2**base ao contador (um bit do peso por vez)
+                if peso & 1:
+                    carry, i = mascara, base
+                    while carry:
+                        while i >= len(planos):
+                            planos.append(0)
+                        planos[i], carry = planos[i] ^ carry, planos[i] & carry
+                        i += 1
+                peso >>= 1
+                base += 1
+        if planos:
+            for j in range(b):
+                cont = 0
+                for i, plano in enumerate(planos):
+                    cont |= ((plano >> j) & 1) << i
+                if cont:
+                    alcancados[j] += cont
+                    soma_dist[j] += cont * nivel
+                    soma_inversos[j] += cont / nivel
+
+        fronteira = proxima
+
+    instrumentacao.contar("msbfs.niveis", nivel)
+    instrumentacao.contar("msbfs.arestas_relaxadas", relaxadas)
+    return alcancados, soma_dist, soma_inversos
+
+
+def _somas_distancias(csr, vertices, tamanho_lote, rotulo):
+    """Executa _msbfs_lote em lotes de fontes; gera (nome, alcancados, soma_dist, soma_inversos)."""
     total = len(vertices)
+    inicio = time.perf_counter()
+    for i in range(0, total, tamanho_lote):
+        lote = vertices[i:i + tamanho_lote]
+        instrumentacao.progresso(rotulo, min(i + tamanho_lote, total), total)
+        with instrumentacao.fase("msbfs"):
+            somas = _msbfs_lote(csr, [csr.indice[v] for v in lote])
+        yield from zip(lote, *somas)
 
-    for idx, v in enumerate(vertices):
-        print(f"Centralidade de proximidade: {idx+1}/{total} vértices processados...", end='\r', flush=True)
-        dist = {v: 0}
-        fila = deque([v])
+    decorrido = time.perf_counter() - inicio
+    instrumentacao.contar("msbfs.fontes", total)
+    instrumentacao.informar(f"{rotulo}: {total} fontes em {decorrido:.2f}s "
+                            f"({total / decorrido if decorrido > 0 else float('inf'):.1f} fontes/s)")
 
-        while fila:
-            u = fila.popleft()
-            for w, _ in grafo.lista_adj.get(u, []):
-                if w not in dist:
-                    dist[w] = dist[u] + 1
-                    fila.append(w)
 
-        reachable = len(dist) - 1
-        total_dist = sum(dist.values())
+def closeness_centrality(grafo, normalizar=False, vertices=None, tamanho_lote=256, reducao=False):
+    """Com `reducao`, grafos não direcionados usam closeness_por_blocos (mesmo resultado)."""
+    csr = grafo.para_csr()
+    if reducao and not csr.direcionado:
+        return closeness_por_blocos(grafo, normalizar, vertices, tamanho_lote)
+    centralidade = {}
+    n = csr.n
+    vertices = csr.nomes if vertices is None else list(vertices)
 
+    for v, reachable, total_dist, _ in _somas_distancias(csr, vertices, tamanho_lote,
+                                                           "Centralidade de proximidade"):
         if reachable > 0 and total_dist > 0:
             valor = reachable / total_dist
             if normalizar and n > 1:
@@ -213,5 +899,581 @@ def closeness_centrality(grafo, normalizar=False, vertices=None):
 
         centralidade[v] = (valor, norm)
 
-    print(" " * 50, end='\r')
+    return centralidade
+
+
+def closeness_harmonica(grafo, normalizar=False, vertices=None, tamanho_lote=256):
+    """Proximidade harmônica: soma de 1/d(v, u) sobre os vértices alcançáveis (normalizada por n - 1)."""
+    csr = grafo.para_csr()
+    centralidade = {}
+    n = csr.n
+    vertices = csr.nomes if vertices is None else list(vertices)
+
+    for v, _, _, valor in _somas_distancias(csr, vertices, tamanho_lote, "Proximidade harmônica"):
+        norm = valor / (n - 1) if normalizar and n > 1 else valor
+        centralidade[v] = (valor, norm)
+
+    return centralidade
+
+
+def _bfs_podada(indptr, indices, s, marca, carimbo, alcance, limiar):
+    """
+    BFS a partir de s que desiste assim que um limite superior da proximidade
+    fica abaixo de `limiar`. Antes de somar o nível L (com f vértices novos),
+    tudo o que falta alcançar está a distância >= L + 1:
+      - alcance conhecido r (não direcionado): r / (S + L*f + (L+1)*(r - c - f));
+      - alcance desconhecido (direcionado): (c + f) / (S + L*f), pois vértices
+        mais distantes que a média atual só diminuem c / S.
+
+    Returns:
+        tuple: (alcancados, soma_dist), ou None se a BFS foi podada.
+    """
+    marca[s] = carimbo
+    fronteira = [s]
+    alcancados = soma = nivel = relaxadas = 0
+    resultado = None
+    while fronteira:
+        proxima = []
+        for v in fronteira:
+            a, b = indptr[v], indptr[v + 1]
+            relaxadas += b - a
+            for w in indices[a:b]:
+                if marca[w] != carimbo:
+                    marca[w] = carimbo
+                    proxima.append(w)
+        if not proxima:
+            resultado = (alcancados, soma)
+            break
+        nivel += 1
+        f = len(proxima)
+        if limiar is not None:
+            if alcance is None:
+                limite = (alcancados + f) / (soma + nivel * f)
+            else:
+                limite = alcance / (soma + nivel * f + (nivel + 1) * (alcance - alcancados - f))
+            if limite < limiar:
+                break
+        alcancados += f
+        soma += nivel * f
+        fronteira = proxima
+    else:
+        resultado = (alcancados, soma)
+
+    instrumentacao.contar("bfs_podada.arestas_relaxadas", relaxadas)
+    return resultado
+
+
+def closeness_top_k(grafo, k=10, normalizar=False, vertices=None):
+    """
+    Os k vértices de maior proximidade (mesma definição de closeness_centrality),
+    sem calcular todos: as fontes são visitadas em ordem decrescente de grau, um
+    heap guarda os k melhores e a BFS de cada fonte é interrompida quando o
+    limite superior do seu valor não alcança mais o k-ésimo (_bfs_podada).
+    Empates seguem a ordem de `vertices`, como em sorted(...)[:k] sobre o
+    resultado de closeness_centrality.
+
+    Returns:
+        dict: nome -> (valor, normalizado), do maior para o menor.
+    """
+    csr = grafo.para_csr()
+    n = csr.n
+    indptr, indices = csr.indptr, csr.indices
+    vertices = csr.nomes if vertices is None else list(vertices)
+
+    # No grafo não direcionado, cada fonte alcança exatamente sua componente
+    alcance = None
+    if not csr.direcionado:
+        alcance = [0] * n
+        for componente in componentes_conexas(grafo):
+            for v in componente:
+                alcance[csr.indice[v]] = len(componente) - 1
+
+    ordem = sorted(range(len(vertices)), key=lambda p: (-csr.grau(csr.indice[vertices[p]]), p))
+    heap = []               # (valor, -posição): o topo é o pior dos k atuais
+    marca = [0] * n
+    podadas = 0
+    total = len(ordem)
+
+    with instrumentacao.fase("closeness_top_k"):
+        for carimbo, p in enumerate(ordem, 1):
+            instrumentacao.progresso(f"Proximidade (top {k})", carimbo, total)
+            i = csr.indice[vertices[p]]
+            limiar = heap[0][0] if len(heap) == k else None
+            resultado = _bfs_podada(indptr, indices, i, marca, carimbo,
+                                    None if alcance is None else alcance[i], limiar)
+            if resultado is None:
+                podadas += 1
+                continue
+            reachable, total_dist = resultado
+            valor = reachable / total_dist if reachable > 0 and total_dist > 0 else 0.0
+            item = (valor, -p)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    instrumentacao.contar("bfs_podada.interrompidas", podadas)
+    instrumentacao.informar(f"Proximidade (top {k}): {podadas}/{total} BFS interrompidas pelo limite superior")
+
+    top = {}
+    for valor, p in sorted(heap, reverse=True):
+        norm = valor * (n - 1) if normalizar and n > 1 else valor
+        top[vertices[-p]] = (valor, norm)
+    return top
+
+# ========== CAMINHO MÍNIMO ENTRE DOIS VÉRTICES ==========
+#
+# Buscas bidirecionais: uma a partir da origem (arestas de saída) e outra a partir
+# do destino (arestas de entrada, pela transposta), até as duas se encontrarem.
+# Cada lado visita só a vizinhança próxima do seu vértice, em vez do grafo inteiro.
+
+def _juntar_caminho(pais, encontro):
+    """Caminho origem -> encontro (pais da ida) seguido de encontro -> destino (pais da volta)."""
+    ida, volta = pais
+    caminho = []
+    v = encontro
+    while v != -1:
+        caminho.append(v)
+        v = ida[v]
+    caminho.reverse()
+    v = volta[encontro]
+    while v != -1:
+        caminho.append(v)
+        v = volta[v]
+    return caminho
+
+
+def _bfs_bidirecional(csr, s, t):
+    """
+    Menor número de arestas de s a t. A cada passo expande um nível inteiro do
+    lado cuja fronteira tem menos arestas a percorrer; o primeiro vértice
+    alcançado pelos dois lados já fecha um caminho mínimo.
+
+    Returns:
+        tuple: (caminho em ids, distância, vértices visitados). Visitados são os
+        vértices expandidos (adjacência percorrida) por ao menos um dos lados.
+    """
+    if s == t:
+        return [s], 0, 1
+    grafos = (csr, csr.transposta())
+    pais = ({s: -1}, {t: -1})
+    dist = ({s: 0}, {t: 0})
+    expandidos = (set(), set())
+    fronteiras = [[s], [t]]
+
+    while fronteiras[0] and fronteiras[1]:
+        custos = [sum(g.indptr[v + 1] - g.indptr[v] for v in f) for g, f in zip(grafos, fronteiras)]
+        lado = 0 if custos[0] <= custos[1] else 1
+        indptr, indices = grafos[lado].indptr, grafos[lado].indices
+        pai, d, outro = pais[lado], dist[lado], dist[1 - lado]
+
+        proxima = []
+        for v in fronteiras[lado]:
+            expandidos[lado].add(v)
+            nivel = d[v] + 1
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if w not in d:
+                    d[w] = nivel
+                    pai[w] = v
+                    if w in outro:
+                        return _juntar_caminho(pais, w), nivel + outro[w], len(expandidos[0] | expandidos[1])
+                    proxima.append(w)
+        fronteiras[lado] = proxima
+
+    return [], math.inf, len(expandidos[0] | expandidos[1])
+
+
+def _dijkstra_bidirecional(csr, s, t):
+    """
+    Menor custo de s a t, com custo 1/peso em cada aresta (mais colaborações,
+    ligação mais curta). Expande o lado de menor distância no topo do heap e
+    para quando a soma dos dois topos alcança o melhor caminho já fechado.
+
+    Returns:
+        tuple: (caminho em ids, custo, vértices visitados). Visitados são os
+        vértices fechados (retirados do heap e expandidos) por ao menos um dos lados.
+    """
+    grafos = (csr, csr.transposta())
+    pais = ({s: -1}, {t: -1})
+    dist = ({s: 0.0}, {t: 0.0})
+    fechados = (set(), set())
+    heaps = ([(0.0, s)], [(0.0, t)])
+    melhor, encontro = (0.0, s) if s == t else (math.inf, -1)
+
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < melhor:
+        lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        dv, v = heapq.heappop(heaps[lado])
+        if v in fechados[lado]:
+            continue
+        fechados[lado].add(v)
+
+        g = grafos[lado]
+        indptr, indices, pesos = g.indptr, g.indices, g.pesos
+        pai, d, outro = pais[lado], dist[lado], dist[1 - lado]
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            nova = dv + 1 / pesos[k]
+            if nova < d.get(w, math.inf):
+                d[w] = nova
+                pai[w] = v
+                heapq.heappush(heaps[lado], (nova, w))
+                if w in outro and nova + outro[w] < melhor:
+                    melhor, encontro = nova + outro[w], w
+
+    visitados = len(fechados[0] | fechados[1])
+    if encontro == -1:
+        return [], math.inf, visitados
+    return _juntar_caminho(pais, encontro), melhor, visitados
+
+
+def caminho_minimo(grafo, origem, destino, ponderado=False):
+    """
+    Caminho mínimo de `origem` a `destino` (no grafo direcionado, seguindo o
+    sentido das arestas) por busca bidirecional: BFS pelo número de arestas ou,
+    com `ponderado`, Dijkstra com custo 1/peso (colaborações mais frequentes
+    aproximam os vértices).
+
+    Returns:
+        tuple: (caminho, distancia, visitados): lista de nomes (vazia se não há
+        caminho), número de arestas ou custo (math.inf sem caminho) e quantos
+        vértices distintos as duas buscas expandiram.
+    """
+    csr = grafo.para_csr()
+    for v in (origem, destino):
+        if v not in csr.indice:
+            raise ValueError(f"Vértice '{v}' não encontrado")
+    s, t = csr.indice[origem], csr.indice[destino]
+
+    with instrumentacao.fase("caminho_minimo"):
+        if ponderado:
+            caminho, distancia, visitados = _dijkstra_bidirecional(csr, s, t)
+        else:
+            caminho, distancia, visitados = _bfs_bidirecional(csr, s, t)
+
+    instrumentacao.contar("caminho_minimo.visitados", visitados)
+    return [csr.nomes[v] for v in caminho], distancia, visitados
+
+# ========== REDUÇÃO POR BLOCOS BICONEXOS ==========
+#
+# No grafo não direcionado, todo caminho mínimo entre vértices de blocos
+# (componentes biconexas) diferentes passa pelos vértices de corte que os
+# separam. Betweenness e closeness exatas podem então ser calculadas dentro de
+# cada bloco, com cada vértice pesando quantos vértices se ligam ao bloco através
+# dele. Blocos de dois vértices (pontes, como as cadeias de vértices de grau 1)
+# não precisam de BFS: só os blocos com três ou mais vértices são percorridos.
+
+def _blocos_biconexos(csr):
+    """
+    Blocos do grafo não direcionado (Hopcroft-Tarjan iterativo). Laços são
+    ignorados e um vértice isolado forma um bloco sozinho.
+
+    Returns:
+        tuple: (blocos, tamanho_componente): listas de ids de cada bloco e, por
+        vértice, o tamanho da sua componente conexa.
+    """
+    indptr, indices = csr.indptr, csr.indices
+    n = csr.n
+    disc = [-1] * n
+    low = [0] * n
+    tamanho_componente = [0] * n
+    blocos = []
+    tempo = 0
+
+    for raiz in range(n):
+        if disc[raiz] != -1:
+            continue
+        disc[raiz] = low[raiz] = tempo
+        tempo += 1
+        pilha = [raiz]
+        componente = [raiz]
+        chamadas = [(raiz, -1, indptr[raiz])]
+
+        while chamadas:
+            v, pai, k = chamadas[-1]
+            if k < indptr[v + 1]:
+                chamadas[-1] = (v, pai, k + 1)
+                w = indices[k]
+                if disc[w] == -1:
+                    disc[w] = low[w] = tempo
+                    tempo += 1
+                    pilha.append(w)
+                    componente.append(w)
+                    chamadas.append((w, v, indptr[w]))
+                elif w != pai and disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                chamadas.pop()
+                if chamadas:
+                    u = chamadas[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                    if low[v] >= disc[u]:
+                        # u separa a subárvore de v: fecha o bloco {u} + pilha até v
+                        bloco = [u]
+                        while True:
+                            x = pilha.pop()
+                            bloco.append(x)
+                            if x == v:
+                                break
+                        blocos.append(bloco)
+
+        if len(componente) == 1:
+            blocos.append([raiz])
+        for v in componente:
+            tamanho_componente[v] = len(componente)
+
+    return blocos, tamanho_componente
+
+
+def _reduzir_em_blocos(csr):
+    """
+    Monta a árvore de blocos e vértices de corte (enraizada no primeiro bloco de
+    cada componente) e o subgrafo de cada bloco com três ou mais vértices.
+
+    Returns:
+        tuple: (blocos, pai, ordem, pesos, tamanho_componente, subgrafos), onde
+        pai[b] é o vértice de corte que liga o bloco b ao bloco pai (-1 na raiz),
+        ordem lista os blocos com os pais antes dos filhos, pesos[b][j] é quantos
+        vértices chegam ao bloco b através de blocos[b][j] (ele incluído) e
+        subgrafos[b] é um GrafoCSR com ids locais (nomes = ids globais).
+    """
+    n = csr.n
+    with instrumentacao.fase("blocos_biconexos"):
+        blocos, tamanho_componente = _blocos_biconexos(csr)
+        blocos_do_vertice = [[] for _ in range(n)]
+        for b, bloco in enumerate(blocos):
+            for v in bloco:
+                blocos_do_vertice[v].append(b)
+
+        # Percurso em largura da árvore: os outros blocos de cada vértice são filhos
+        pai = [-1] * len(blocos)
+        visitado = bytearray(len(blocos))
+        ordem = []
+        for raiz in range(len(blocos)):
+            if visitado[raiz]:
+                continue
+            visitado[raiz] = 1
+            ordem.append(raiz)
+            i = len(ordem) - 1
+            while i < len(ordem):
+                b = ordem[i]
+                i += 1
+                for v in blocos[b]:
+                    if v == pai[b]:
+                        continue
+                    for filho in blocos_do_vertice[v]:
+                        if not visitado[filho]:
+                            visitado[filho] = 1
+                            pai[filho] = v
+                            ordem.append(filho)
+
+        # Vértices "abaixo" de cada um (ele e os blocos filhos), das folhas para a raiz
+        abaixo = [1] * n
+        pendurados = [0] * len(blocos)
+        for b in reversed(ordem):
+            p = pai[b]
+            pendurados[b] = sum(abaixo[v] for v in blocos[b] if v != p)
+            if p >= 0:
+                abaixo[p] += pendurados[b]
+        pesos = [[abaixo[v] if v != pai[b] else tamanho_componente[v] - pendurados[b] for v in bloco]
+                 for b, bloco in enumerate(blocos)]
+
+        # Cada aresta pertence a um único bloco: o comum às duas pontas
+        adjacencias = {b: [[] for _ in bloco] for b, bloco in enumerate(blocos) if len(bloco) >= 3}
+        posicao = {b: {v: j for j, v in enumerate(blocos[b])} for b in adjacencias}
+        indptr, indices = csr.indptr, csr.indices
+        for u in range(n):
+            for w in indices[indptr[u]:indptr[u + 1]]:
+                if w <= u:
+                    continue
+                if len(blocos_do_vertice[u]) == 1:
+                    b = blocos_do_vertice[u][0]
+                elif len(blocos_do_vertice[w]) == 1:
+                    b = blocos_do_vertice[w][0]
+                else:
+                    b = (set(blocos_do_vertice[u]) & set(blocos_do_vertice[w])).pop()
+                if b in adjacencias:
+                    iu, iw = posicao[b][u], posicao[b][w]
+                    adjacencias[b][iu].append(iw)
+                    adjacencias[b][iw].append(iu)
+
+        subgrafos = {}
+        for b, adjacencia in adjacencias.items():
+            ptr, idx = array('q', [0]), array('i')
+            for vizinhos in adjacencia:
+                idx.extend(vizinhos)
+                ptr.append(len(idx))
+            subgrafos[b] = GrafoCSR(blocos[b], ptr, idx, None, num_arestas=len(idx) // 2,
+                                    indice=posicao[b])
+
+    instrumentacao.contar("blocos.quantidade", len(blocos))
+    instrumentacao.contar("blocos.vertices_de_corte", sum(1 for bs in blocos_do_vertice if len(bs) > 1))
+    return blocos, pai, ordem, pesos, tamanho_componente, subgrafos
+
+
+# Subgrafos dos blocos (n, indptr, indices, pesos) em cada processo trabalhador
+_blocos_trabalhador = None
+
+def _iniciar_trabalhador_blocos(subgrafos):
+    global _blocos_trabalhador
+    _blocos_trabalhador = subgrafos
+
+def _brandes_ponderado_bloco(b, fontes):
+    n, indptr, indices, pesos = _blocos_trabalhador[b]
+    return _brandes_fontes(n, indptr, indices, fontes, pesos=pesos)
+
+
+def _betweenness_blocos(csr, reducao, workers=1):
+    """Soma das dependências (por id, como _somar_dependencias) a partir da redução em blocos."""
+    blocos, pai, ordem, pesos, tamanho_componente, subgrafos = reducao
+    n = csr.n
+
+    # Pares separados por um vértice de corte: todos os seus caminhos passam por ele.
+    # Cada bloco de v deixa do outro lado (C - peso) vértices; a soma é C - 1.
+    soma = [0.0] * n
+    separados = [0] * n
+    for b, bloco in enumerate(blocos):
+        for v, peso in zip(bloco, pesos[b]):
+            separados[v] += (tamanho_componente[v] - peso) ** 2
+    for v in range(n):
+        soma[v] = float((tamanho_componente[v] - 1) ** 2 - separados[v])
+
+    # Pares que atravessam um bloco: Brandes ponderado dentro do bloco
+    dados = {b: (sub.n, _serializavel(sub.indptr), _serializavel(sub.indices), pesos[b])
+             for b, sub in subgrafos.items()}
+    tarefas = [(b, list(range(i, min(i + FONTES_POR_BLOCO, dados[b][0]))))
+               for b in sorted(dados) for i in range(0, dados[b][0], FONTES_POR_BLOCO)]
+    total = sum(len(fontes) for _, fontes in tarefas)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = None
+    if workers > 1 and len(tarefas) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_trabalhador_blocos,
+                                       initargs=(dados,))
+    try:
+        if executor is not None:
+            parciais = executor.map(_brandes_ponderado_bloco, *zip(*tarefas))
+        else:
+            parciais = (_brandes_fontes(*dados[b][:3], fontes, pesos=dados[b][3]) for b, fontes in tarefas)
+
+        feitos = relaxadas_total = 0
+        with instrumentacao.fase("brandes_blocos"):
+            for (b, fontes), (parcial, _, _, (relaxadas, _, _)) in zip(tarefas, parciais):
+                feitos += len(fontes)
+                instrumentacao.progresso("Betweenness (blocos)", feitos, total)
+                for v, valor in zip(blocos[b], parcial):
+                    soma[v] += valor
+                relaxadas_total += relaxadas
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Um vértice de corte é fonte em cada bloco de 3+ vértices a que pertence:
+    # conta-se uma vez. O custo do Brandes no grafo inteiro é de n BFS de E arestas.
+    fontes_distintas = len({blocos[b][j] for b, fontes in tarefas for j in fontes})
+    instrumentacao.limpar_linha()
+    instrumentacao.contar("blocos.fontes_brandes", total)
+    instrumentacao.contar("blocos.arestas_relaxadas", relaxadas_total)
+    instrumentacao.informar(f"Betweenness por blocos: {total} BFS em {len(subgrafos)} blocos com 3+ vértices, "
+                            f"{fontes_distintas} de {n} vértices como fonte; {relaxadas_total} arestas relaxadas "
+                            f"no lugar de {n * csr.indptr[n]} no grafo inteiro")
+    return soma
+
+
+def _somas_distancias_blocos(csr, reducao, tamanho_lote=256):
+    """
+    Soma das distâncias de cada vértice a todos os da sua componente, pela árvore
+    de blocos: para v no bloco B, soma(v) = Σ_x [pesos_B(x) * d(v, x) + D_B(x)],
+    onde D_B(x) é a soma das distâncias de x aos vértices que chegam a B por x.
+    """
+    blocos, pai, ordem, pesos, tamanho_componente, subgrafos = reducao
+    n = csr.n
+    bfs = relaxadas = 0
+    fontes_distintas = set()
+
+    # Das folhas para a raiz: D dos vértices abaixo (blocos filhos) e do bloco inteiro visto do pai
+    dist_abaixo = [0] * n
+    dist_pendurados = [0] * len(blocos)
+    for b in reversed(ordem):
+        p = pai[b]
+        if p < 0:
+            continue
+        bloco = blocos[b]
+        if b in subgrafos:
+            sub = subgrafos[b]
+            _, soma_dist, _ = _msbfs_lote(sub, [sub.indice[p]], pesos[b])
+            bfs += 1
+            relaxadas += sub.indptr[sub.n]
+            fontes_distintas.add(p)
+            total = soma_dist[0]
+        else:
+            total = sum(peso for v, peso in zip(bloco, pesos[b]) if v != p)
+        dist_pendurados[b] = total + sum(dist_abaixo[v] for v in bloco if v != p)
+        dist_abaixo[p] += dist_pendurados[b]
+
+    # Da raiz para as folhas: cada vértice é fonte uma única vez, no bloco acima dele
+    somas = [0] * n
+    for b in ordem:
+        p = pai[b]
+        bloco = blocos[b]
+        constante = sum(somas[p] - dist_pendurados[b] if v == p else dist_abaixo[v] for v in bloco)
+        fontes = [j for j, v in enumerate(bloco) if v != p]
+        if b in subgrafos:
+            for i in range(0, len(fontes), tamanho_lote):
+                lote = fontes[i:i + tamanho_lote]
+                _, soma_dist, _ = _msbfs_lote(subgrafos[b], lote, pesos[b])
+                for j, s in zip(lote, soma_dist):
+                    somas[bloco[j]] = s + constante
+            bfs += len(fontes)
+            # Cada fonte percorre o bloco inteiro (as BFS do lote dividem as passadas)
+            relaxadas += len(fontes) * subgrafos[b].indptr[subgrafos[b].n]
+            fontes_distintas.update(bloco[j] for j in fontes)
+        else:
+            # Ponte (ou vértice isolado): o outro vértice está a distância 1
+            peso_total = sum(pesos[b])
+            for j in fontes:
+                somas[bloco[j]] = peso_total - pesos[b][j] + constante
+
+    instrumentacao.contar("blocos.fontes_msbfs", bfs)
+    instrumentacao.contar("blocos.arestas_percorridas", relaxadas)
+    instrumentacao.informar(f"Proximidade por blocos: {bfs} BFS em blocos com 3+ vértices, "
+                            f"{len(fontes_distintas)} de {n} vértices como fonte; {relaxadas} arestas "
+                            f"percorridas no lugar de {n * csr.indptr[n]} no grafo inteiro")
+    return [(tamanho_componente[v] - 1, somas[v]) for v in range(n)]
+
+
+def betweenness_por_blocos(grafo, normalizar=False, workers=1):
+    """
+    Mesmo resultado de betweenness_centrality (a menos de arredondamento), com
+    Brandes só dentro dos blocos biconexos de três ou mais vértices. Somente para
+    grafos não direcionados.
+    """
+    csr = grafo.para_csr()
+    if csr.direcionado:
+        raise ValueError("A redução por blocos só vale para grafos não direcionados")
+    soma = _betweenness_blocos(csr, _reduzir_em_blocos(csr), workers)
+    return _montar_betweenness(csr, soma, normalizar)
+
+
+def closeness_por_blocos(grafo, normalizar=False, vertices=None, tamanho_lote=256):
+    """
+    Mesmo resultado de closeness_centrality, com as BFS restritas aos blocos
+    biconexos de três ou mais vértices. Somente para grafos não direcionados.
+    """
+    csr = grafo.para_csr()
+    if csr.direcionado:
+        raise ValueError("A redução por blocos só vale para grafos não direcionados")
+    n = csr.n
+    somas = _somas_distancias_blocos(csr, _reduzir_em_blocos(csr), tamanho_lote)
+    vertices = csr.nomes if vertices is None else list(vertices)
+
+    centralidade = {}
+    for v in vertices:
+        reachable, total_dist = somas[csr.indice[v]]
+        if reachable > 0 and total_dist > 0:
+            valor = reachable / total_dist
+            centralidade[v] = (valor, valor * (n - 1) if normalizar and n > 1 else valor)
+        else:
+            centralidade[v] = (0.0, 0.0)
     return centralidade
@@ -0,0 +1,273 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import instrumentacao
+from grafo import (
+    TIPOS,
+    carregar_dados_padronizados,
+    construir_grafo_participantes,
+    construir_grafo_direcional,
+    construir_todos_grafos
+)
+from algoritmos import (
+    componentes_conexas,
+    componentes_fortemente_conexas,
+    condensacao_scc,
+    agm_prim,
+    floresta_geradora_minima,
+    agm_prim_indexado,
+    degree_centrality,
+    betweenness_centrality,
+    betweenness_e_closeness,
+    betweenness_por_blocos,
+    betweenness_aproximada,
+    betweenness_top_k,
+    closeness_centrality,
+    closeness_por_blocos,
+    closeness_harmonica,
+    closeness_top_k,
+    caminho_minimo
+)
+from distribuicoes import distribuicoes
+
+# ========== DADOS SINTÉTICOS ==========
+
+# Tamanho do conjunto real (títulos com elenco e diretor, atores e diretores distintos)
+TITULOS_REAIS = 19600
+ATORES_REAIS = 61800
+DIRETORES_REAIS = 10900
+
+
+def gerar_titulos(n_titulos, n_atores, n_diretores, expoente=0.8, semente=0):
+    """
+    Gera elencos e diretores com popularidade em lei de potência: a pessoa de
+    posição i é sorteada com peso 1 / (i + 1) ** expoente, de modo que poucos
+    atores e diretores aparecem em muitos títulos e a maioria em um só.
+    Uma pequena parte dos diretores também atua (mesmo nome nas duas listas).
+
+    Returns:
+        tuple: (elencos, diretores), no formato de carregar_dados_padronizados.
+    """
+    rng = np.random.default_rng(semente)
+    atores = [f"ATOR {i}" for i in range(n_atores)]
+    pessoas_diretoras = [f"DIRETOR {i}" for i in range(n_diretores)]
+    for j, i in enumerate(rng.choice(n_atores, size=n_diretores // 20, replace=False)):
+        pessoas_diretoras[j] = atores[i]
+
+    def pesos(n):
+        p = 1.0 / np.arange(1, n + 1) ** expoente
+        return p / p.sum()
+
+    # Tamanho do elenco com cauda longa (mediana ~5, alguns com dezenas de atores)
+    tamanhos_elenco = np.minimum(1 + rng.geometric(0.15, size=n_titulos), 60)
+    tamanhos_direcao = 1 + (rng.random(n_titulos) < 0.1)
+    sorteio_atores = rng.choice(n_atores, size=int(tamanhos_elenco.sum()), p=pesos(n_atores))
+    sorteio_diretores = rng.choice(n_diretores, size=int(tamanhos_direcao.sum()), p=pesos(n_diretores))
+
+    elencos, diretores = [], []
+    a = d = 0
+    for k_elenco, k_direcao in zip(tamanhos_elenco.tolist(), tamanhos_direcao.tolist()):
+        elencos.append(list(dict.fromkeys(atores[i] for i in sorteio_atores[a:a + k_elenco])))
+        diretores.append(list(dict.fromkeys(pessoas_diretoras[i] for i in sorteio_diretores[d:d + k_direcao])))
+        a += k_elenco
+        d += k_direcao
+    return elencos, diretores
+
+
+def escrever_csv(caminho, elencos, diretores):
+    """Grava os títulos no mesmo formato do CSV original (colunas 'director' e 'cast')."""
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['show_id', 'type', 'title', 'director', 'cast'])
+        for i, (elenco, direcao) in enumerate(zip(elencos, diretores)):
+            escritor.writerow([f"s{i + 1}", 'Movie', f"Título {i + 1}", ', '.join(direcao), ', '.join(elenco)])
+
+# ========== MEDIÇÃO ==========
+
+def medir(funcao, memoria=True):
+    """
+    Executa funcao() com a instrumentação silenciosa (e as demais mensagens
+    descartadas) e mede o tempo de relógio e, se `memoria`, o pico de memória
+    alocada (tracemalloc).
+
+    Returns:
+        tuple: (resultado, segundos, pico_bytes ou None, contadores da instrumentação)
+    """
+    anterior = instrumentacao.usar(instrumentacao.Instrumentacao(silenciosa=True))
+    if memoria:
+        tracemalloc.start()
+    try:
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            segundos = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] if memoria else None
+    finally:
+        if memoria:
+            tracemalloc.stop()
+        contadores = instrumentacao.usar(anterior).perfil()['contadores']
+    return resultado, segundos, pico, contadores
+
+
+def _primeiro_vertice(grafo):
+    return grafo.para_csr().nomes[0] if grafo.para_csr().n else None
+
+
+# Consultas de caminho mínimo por medição: uma consulta isolada leva menos de um
+# milissegundo, então cada medição é de um lote de pares sorteados (sempre os
+# mesmos): o tempo por consulta é o tempo registrado dividido por CONSULTAS_CAMINHO
+CONSULTAS_CAMINHO = 100
+
+
+def _consultas_caminho(grafo, ponderado):
+    nomes = grafo.para_csr().nomes
+    if not nomes:
+        return []
+    rng = np.random.default_rng(0)
+    pares = rng.integers(len(nomes), size=(CONSULTAS_CAMINHO, 2)).tolist()
+    return [caminho_minimo(grafo, nomes[a], nomes[b], ponderado) for a, b in pares]
+
+
+# Algoritmos medidos: (nome, tipos de grafo em que rodam, chamada)
+ALGORITMOS = [
+    ('componentes_conexas', ('atores', 'diretores', 'direcional'), componentes_conexas),
+    ('componentes_fortemente_conexas', ('direcional',), componentes_fortemente_conexas),
+    ('condensacao_scc', ('direcional',), condensacao_scc),
+    ('agm_prim', ('atores', 'diretores'), lambda g: agm_prim(g, _primeiro_vertice(g))),
+    ('agm_prim_indexado', ('atores', 'diretores'), lambda g: agm_prim_indexado(g, _primeiro_vertice(g))),
+    ('floresta_geradora_minima', ('atores', 'diretores'), floresta_geradora_minima),
+    ('degree_centrality', ('atores', 'diretores', 'direcional'), degree_centrality),
+    ('betweenness_centrality', ('atores', 'diretores', 'direcional'), betweenness_centrality),
+    ('betweenness_e_closeness', ('atores', 'diretores', 'direcional'), betweenness_e_closeness),
+    ('betweenness_por_blocos', ('atores', 'diretores'), betweenness_por_blocos),
+    ('betweenness_aproximada', ('atores', 'diretores', 'direcional'),
+     lambda g: betweenness_aproximada(g, amostras=256, semente=0)),
+    ('betweenness_top_k', ('atores', 'diretores', 'direcional'), lambda g: betweenness_top_k(g, semente=0)),
+    ('closeness_centrality', ('atores', 'diretores', 'direcional'), closeness_centrality),
+    ('closeness_por_blocos', ('atores', 'diretores'), closeness_por_blocos),
+    ('closeness_harmonica', ('atores', 'diretores', 'direcional'), closeness_harmonica),
+    ('closeness_top_k', ('atores', 'diretores', 'direcional'), closeness_top_k),
+    ('distribuicoes', ('atores', 'diretores', 'direcional'), distribuicoes),
+    ('caminho_minimo', ('atores', 'diretores', 'direcional'),
+     lambda g: _consultas_caminho(g, ponderado=False)),
+    ('caminho_minimo_ponderado', ('atores', 'diretores', 'direcional'),
+     lambda g: _consultas_caminho(g, ponderado=True)),
+]
+
+# ========== EXECUÇÃO ==========
+
+def executar_escala(escala, args, registros):
+    n_titulos = max(1, round(TITULOS_REAIS * escala))
+    n_atores = max(1, round(ATORES_REAIS * escala))
+    n_diretores = max(1, round(DIRETORES_REAIS * escala))
+
+    def registrar(etapa, tipo, segundos, pico, contadores, grafo=None):
+        registro = {
+            'escala': escala, 'titulos': n_titulos, 'etapa': etapa, 'grafo': tipo,
+            'segundos': round(segundos, 6), 'pico_bytes': pico, 'contadores': contadores,
+        }
+        if grafo is not None:
+            registro['vertices'], registro['arestas'] = grafo.obter_info()
+        registros.append(registro)
+        pico_txt = f", pico {pico / 2**20:.1f} MB" if pico is not None else ""
+        print(f"[{escala:g}] {etapa}{f' ({tipo})' if tipo else ''}: {segundos:.3f}s{pico_txt}")
+
+    print(f"\n===== ESCALA {escala:g}: {n_titulos} títulos, {n_atores} atores, {n_diretores} diretores =====")
+    elencos, diretores = gerar_titulos(n_titulos, n_atores, n_diretores, semente=args.semente)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'titulos.csv')
+        escrever_csv(caminho, elencos, diretores)
+        (elencos, diretores), segundos, pico, contadores = medir(
+            lambda: carregar_dados_padronizados(caminho), args.memoria)
+        registrar('carregar_dados_padronizados', None, segundos, pico, contadores)
+
+    construtores = {
+        'atores': ('construir_grafo_participantes',
+                   lambda: construir_grafo_participantes(elencos, diretores, tipo='atores')),
+        'diretores': ('construir_grafo_participantes',
+                      lambda: construir_grafo_participantes(elencos, diretores, tipo='diretores')),
+        'direcional': ('construir_grafo_direcional', lambda: construir_grafo_direcional(elencos, diretores)),
+    }
+    grafos = {}
+    for tipo in args.grafos:
+        etapa, construir = construtores[tipo]
+        grafo, segundos, pico, contadores = medir(construir, args.memoria)
+        registrar(etapa, tipo, segundos, pico, contadores, grafo)
+        _, segundos, pico, contadores = medir(grafo.para_csr, args.memoria)
+        registrar('para_csr', tipo, segundos, pico, contadores, grafo)
+        grafos[tipo] = grafo
+
+    _, segundos, pico, contadores = medir(lambda: construir_todos_grafos(elencos, diretores), args.memoria)
+    registrar('construir_todos_grafos', None, segundos, pico, contadores)
+
+    for nome, tipos, funcao in ALGORITMOS:
+        if args.algoritmos and nome not in args.algoritmos:
+            continue
+        for tipo in tipos:
+            if tipo in grafos:
+                _, segundos, pico, contadores = medir(lambda: funcao(grafos[tipo]), args.memoria)
+                registrar(nome, tipo, segundos, pico, contadores, grafos[tipo])
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(
+        description="Benchmark com dados sintéticos do tamanho do conjunto real (escala 1 = "
+                    f"{TITULOS_REAIS} títulos, {ATORES_REAIS} atores, {DIRETORES_REAIS} diretores).")
+    # A betweenness exata cresce com V * E: nas escalas maiores, convém limitar --algoritmos
+    parser.add_argument("--escalas", default="0.005,0.01,0.02",
+                        help="Frações do tamanho real, separadas por vírgula (padrão: 0.005,0.01,0.02).")
+    parser.add_argument("--graph", dest="grafos", default=",".join(TIPOS),
+                        help=f"Grafos medidos, separados por vírgula ({', '.join(TIPOS)}).")
+    parser.add_argument("--algoritmos", default="",
+                        help="Só estes algoritmos (nomes das funções, separados por vírgula).")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do gerador de dados.")
+    parser.add_argument("--sem-memoria", dest="memoria", action="store_false",
+                        help="Não mede o pico de memória (tracemalloc deixa o código mais lento).")
+    parser.add_argument("--saida", default=os.path.join("resultados", "benchmark.json"),
+                        help="Arquivo JSON com as medições (padrão: resultados/benchmark.json).")
+    args = parser.parse_args()
+
+    args.escalas = [float(e) for e in args.escalas.split(",") if e.strip()]
+    args.grafos = [t.strip() for t in args.grafos.split(",") if t.strip()]
+    args.algoritmos = [a.strip() for a in args.algoritmos.split(",") if a.strip()]
+    invalidos = [t for t in args.grafos if t not in TIPOS]
+    invalidos += [a for a in args.algoritmos if a not in {nome for nome, _, _ in ALGORITMOS}]
+    if invalidos:
+        parser.error(f"grafo ou algoritmo inválido: {', '.join(invalidos)}")
+    return args
+
+
+def main():
+    args = ler_argumentos()
+    registros = []
+    for escala in args.escalas:
+        executar_escala(escala, args, registros)
+
+    relatorio = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'semente': args.semente,
+        'memoria_medida': args.memoria,
+        'medicoes': registros,
+    }
+    os.makedirs(os.path.dirname(args.saida) or ".", exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\nMedições gravadas em '{args.saida}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from grafo import GrafoCSR
+
+# ========== CACHE BINÁRIO DE GRAFOS ==========
+#
+# Formato do arquivo (.csr), versão 1:
+#   MAGICO (8 bytes) | versão (uint32) | tamanho do cabeçalho (uint32) | cabeçalho JSON
+#   e, a partir de posições múltiplas de 8, as seções indptr ('q'), indices ('i'),
+#   pesos ('q' ou 'd') e nomes (UTF-8 separados por '\0').
+# As seções numéricas são mapeadas em memória e usadas diretamente, sem cópia.
+
+MAGICO = b'GRAFOCSR'
+VERSAO_FORMATO = 1
+DIRETORIO_CACHE = '.cache_grafos'
+
+
+def _alinhar(posicao):
+    return (posicao + 7) & ~7
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """SHA-256 do conteúdo do arquivo."""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def chave_cache(caminho_csv, tipo, **parametros):
+    """Chave do cache: hash do CSV + tipo do grafo + parâmetros de construção + versão do formato."""
+    h = hashlib.sha256()
+    h.update(hash_arquivo(caminho_csv).encode())
+    h.update(json.dumps({'tipo': tipo, 'versao': VERSAO_FORMATO, **parametros}, sort_keys=True).encode())
+    return h.hexdigest()[:24]
+
+
+def salvar_csr(csr, caminho, **metadados):
+    """Grava o GrafoCSR no formato binário (escrita atômica via arquivo temporário)."""
+    secoes = [
+        ('indptr', memoryview(csr.indptr).cast('B')),
+        ('indices', memoryview(csr.indices).cast('B')),
+        ('pesos', memoryview(csr.pesos).cast('B')),
+        ('nomes', '\0'.join(csr.nomes).encode('utf-8')),
+    ]
+    cabecalho = {
+        'n': csr.n,
+        'num_arestas': csr.num_arestas,
+        'direcionado': csr.direcionado,
+        'byteorder': sys.byteorder,
+        'formatos': {'indptr': 'q', 'indices': 'i', 'pesos': _formato(csr.pesos)},
+        'metadados': metadados,
+    }
+
+    # As posições das seções dependem do tamanho do cabeçalho, que contém as posições:
+    # calcula com espaço reservado e ajusta até estabilizar.
+    posicoes = {}
+    while True:
+        cabecalho['secoes'] = posicoes
+        bruto = json.dumps(cabecalho, sort_keys=True).encode('utf-8')
+        pos = _alinhar(len(MAGICO) + 8 + len(bruto))
+        novas = {}
+        for nome, dados in secoes:
+            novas[nome] = [pos, len(dados)]
+            pos = _alinhar(pos + len(dados))
+        if novas == posicoes:
+            break
+        posicoes = novas
+
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(MAGICO)
+        f.write(struct.pack('<II', VERSAO_FORMATO, len(bruto)))
+        f.write(bruto)
+        for nome, dados in secoes:
+            inicio, _ = posicoes[nome]
+            f.write(b'\0' * (inicio - f.tell()))
+            f.write(dados)
+    os.replace(temporario, caminho)
+
+
+def abrir_csr(caminho):
+    """
+    Abre um arquivo .csr mapeando-o em memória. Retorna o GrafoCSR ou None se o
+    arquivo for de outra versão/arquitetura ou estiver corrompido.
+    """
+    try:
+        # Arquivo vazio (ValueError no mmap) conta como ausência de cache
+        with open(caminho, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return None
+
+    try:
+        csr = _ler_csr(mapa)
+    except (ValueError, KeyError, TypeError, struct.error):
+        csr = None
+    if csr is None:
+        # Fora do except: as vistas sobre o mapa já foram liberadas e ele pode ser fechado
+        mapa.close()
+        return None
+
+    csr._mapa = mapa          # Mantém o mapeamento vivo enquanto o grafo existir
+    return csr
+
+
+def _ler_csr(mapa):
+    """Monta o GrafoCSR sobre o arquivo mapeado; None se o cabeçalho não servir ou o arquivo estiver truncado."""
+    if mapa[:len(MAGICO)] != MAGICO:
+        return None
+    versao, tamanho = struct.unpack_from('<II', mapa, len(MAGICO))
+    if versao != VERSAO_FORMATO:
+        return None
+    inicio = len(MAGICO) + 8
+    cabecalho = json.loads(mapa[inicio:inicio + tamanho].decode('utf-8'))
+    if cabecalho['byteorder'] != sys.byteorder:
+        return None
+    if any(pos + comprimento > len(mapa) for pos, comprimento in cabecalho['secoes'].values()):
+        return None
+
+    visao = memoryview(mapa)
+    secoes = {nome: visao[pos:pos + comprimento] for nome, (pos, comprimento) in cabecalho['secoes'].items()}
+    formatos = cabecalho['formatos']
+    nomes = [sys.intern(nome) for nome in bytes(secoes['nomes']).decode('utf-8').split('\0')] \
+        if cabecalho['n'] else []
+    return GrafoCSR(
+        nomes,
+        secoes['indptr'].cast(formatos['indptr']),
+        secoes['indices'].cast(formatos['indices']),
+        secoes['pesos'].cast(formatos['pesos']),
+        cabecalho['direcionado'],
+        cabecalho['num_arestas'],
+    )
+
+
+def _formato(arr):
+    return getattr(arr, 'typecode', None) or arr.format
+
+
+def caminho_cache(caminho_csv, tipo, diretorio=DIRETORIO_CACHE):
+    """Arquivo .csr em que o grafo do tipo pedido, para o CSV atual, fica (ou ficará) em cache."""
+    return os.path.join(diretorio, f"{tipo}-{chave_cache(caminho_csv, tipo)}.csr")
+
+
+def carregar_ou_construir(caminho_csv, tipo, construir, diretorio=DIRETORIO_CACHE):
+    """
+    Retorna o grafo do tipo pedido a partir do cache, se houver um válido para o
+    CSV atual; senão chama construir() (que deve devolver um Grafo ou GrafoCSR),
+    grava o resultado no cache e o retorna. Arquivos antigos do mesmo tipo
+    (de versões anteriores do CSV) são removidos.
+
+    construir() também pode gravar o grafo ela mesma no arquivo de
+    caminho_cache(caminho_csv, tipo) (como construir_externo com caminho_saida),
+    devolvendo o GrafoCSR mapeado dele: nesse caso o arquivo não é regravado.
+    """
+    caminho = caminho_cache(caminho_csv, tipo, diretorio)
+
+    if os.path.exists(caminho):
+        csr = abrir_csr(caminho)
+        if csr is not None:
+            print(f"Grafo de {tipo} carregado do cache '{caminho}'.")
+            return csr
+        os.remove(caminho)          # Corrompido: não pode ser confundido com um gravado por construir()
+
+    os.makedirs(diretorio, exist_ok=True)
+    csr = construir().para_csr()
+
+    for arquivo in os.listdir(diretorio):
+        if arquivo.startswith(f"{tipo}-") and arquivo.endswith('.csr') and arquivo != os.path.basename(caminho):
+            os.remove(os.path.join(diretorio, arquivo))
+    if not os.path.exists(caminho):
+        salvar_csr(csr, caminho, tipo=tipo, csv=os.path.basename(caminho_csv))
+    print(f"Grafo de {tipo} salvo no cache '{caminho}'.")
+    return csr
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+# ========== CACHE DE RESULTADOS ==========
+#
+# Resultados de algoritmos (componentes, centralidades, AGMs) indexados pela
+# impressão digital do grafo, pelo nome do algoritmo, pelos parâmetros e pela
+# versão dos resultados.
+# Ficam em um LRU em memória (limitado por número de itens) e em disco, em
+# arquivos pickle (limitado por bytes, removendo os menos usados recentemente).
+
+DIRETORIO_RESULTADOS = '.cache_resultados'
+# Faz parte da chave: deve ser incrementada sempre que um algoritmo mudar o que
+# calcula, para que os pickles gravados pela versão anterior deixem de ser usados.
+VERSAO_RESULTADOS = 3
+
+
+class CacheResultados:
+    def __init__(self, diretorio=DIRETORIO_RESULTADOS, max_itens_memoria=16, max_bytes_disco=512 * 2**20):
+        self.diretorio = diretorio
+        self.max_itens_memoria = max_itens_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self.memoria = OrderedDict()        # chave -> resultado, do menos ao mais recente
+        self.origem = {}                    # chave -> (impressão do grafo, algoritmo), dos itens em memória
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.faltas = 0
+
+    @staticmethod
+    def chave(grafo, algoritmo, parametros):
+        conteudo = json.dumps([VERSAO_RESULTADOS, grafo.para_csr().impressao_digital(), algoritmo, parametros],
+                              sort_keys=True, default=str)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + '.pkl')
+
+    def obter(self, grafo, algoritmo, calcular, **parametros):
+        """
+        Retorna o resultado de `algoritmo` com `parametros` para o grafo, buscando
+        em memória, depois em disco; se não houver, chama calcular() e guarda.
+        """
+        chave = self.chave(grafo, algoritmo, parametros)
+        self.origem[chave] = (grafo.para_csr().impressao_digital(), algoritmo)
+
+        if chave in self.memoria:
+            self.memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+            return self.memoria[chave]
+
+        caminho = self._caminho(chave)
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'rb') as f:
+                    resultado = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                resultado = None
+            else:
+                os.utime(caminho)           # marca como usado recentemente
+                self.acertos_disco += 1
+                self._guardar_memoria(chave, resultado)
+                return resultado
+
+        self.faltas += 1
+        resultado = calcular()
+        self._guardar_memoria(chave, resultado)
+        self._guardar_disco(chave, resultado)
+        return resultado
+
+    def _guardar_memoria(self, chave, resultado):
+        self.memoria[chave] = resultado
+        self.memoria.move_to_end(chave)
+        while len(self.memoria) > self.max_itens_memoria:
+            antiga, _ = self.memoria.popitem(last=False)
+            self.origem.pop(antiga, None)
+
+    def _guardar_disco(self, chave, resultado):
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+
+        # Remove os arquivos usados há mais tempo até caber no limite
+        arquivos = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.pkl'):
+                info = os.stat(os.path.join(self.diretorio, nome))
+                arquivos.append((info.st_mtime, info.st_size, nome))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, nome in sorted(arquivos):
+            if total <= self.max_bytes_disco or nome == chave + '.pkl':
+                continue
+            os.remove(os.path.join(self.diretorio, nome))
+            total -= tamanho
+
+    def descartar_grafo(self, impressao):
+        """
+        Remove da memória os resultados do grafo com essa impressão digital (por
+        exemplo, porque o grafo foi alterado) e retorna os nomes dos algoritmos
+        que ficaram desatualizados. Os arquivos em disco continuam válidos para
+        aquela versão do grafo e saem pelo LRU.
+        """
+        algoritmos = set()
+        for chave, (dono, algoritmo) in list(self.origem.items()):
+            if dono == impressao:
+                algoritmos.add(algoritmo)
+                self.memoria.pop(chave, None)
+                del self.origem[chave]
+        return sorted(algoritmos)
+
+    def limpar_memoria(self):
+        self.memoria.clear()
+        self.origem.clear()
+
+    def estatisticas(self):
+        return {
+            'acertos_memoria': self.acertos_memoria,
+            'acertos_disco': self.acertos_disco,
+            'faltas': self.faltas,
+            'itens_memoria': len(self.memoria),
+        }
+
+    def __str__(self):
+        e = self.estatisticas()
+        return (f"Cache de resultados: {e['acertos_memoria'] + e['acertos_disco']} acertos "
+                f"({e['acertos_memoria']} em memória, {e['acertos_disco']} em disco), "
+                f"{e['faltas']} faltas, {e['itens_memoria']} itens em memória")
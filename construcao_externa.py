@@ -0,0 +1,350 @@
+import argparse
+import heapq
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from itertools import combinations, groupby, islice, product
+
+import instrumentacao
+from grafo import TIPOS, GrafoCSR, iterar_blocos_padronizados
+from cache_grafo import abrir_csr, salvar_csr
+
+# ========== CONSTRUÇÃO FORA DA MEMÓRIA ==========
+#
+# Para catálogos que não cabem na memória: o CSV é lido em blocos e os pares
+# (u, v) de cada título são contados em memória até o orçamento; então as
+# contagens são gravadas, ordenadas, em um arquivo temporário (um "run"). No
+# fim, os runs são intercalados (heapq.merge) somando os pesos de pares iguais,
+# e a forma compacta é montada a partir do fluxo ordenado. Só os nomes dos
+# vértices e o indptr ficam em memória; as arestas passam pelo disco.
+#
+# Cada par guarda também a ordem da sua primeira ocorrência: os vizinhos de
+# cada vértice saem na mesma ordem dos construtores em memória (a de inserção
+# em Grafo.de_contagens), e o GrafoCSR resultante é idêntico ao de para_csr().
+
+BYTES_POR_PAR = 200         # Estimativa por entrada do Counter (tupla de dois nomes + contagem)
+BYTES_POR_REGISTRO = 140    # Estimativa por tupla (origem, ordem, destino, peso) em uma lista
+REGISTROS_POR_LOTE = 512    # Registros por pickle (o que cada run mantém em memória na intercalação)
+MAXIMO_RUNS = 64            # Runs intercalados de uma vez; acima disso, intercala em etapas
+
+
+class _Runs:
+    """
+    Runs ordenados em disco. Cada run é uma sequência de listas de registros
+    (tuplas) gravadas com pickle.
+    """
+    def __init__(self, diretorio, prefixo):
+        self.diretorio = diretorio
+        self.prefixo = prefixo
+        self.caminhos = []
+        self.registros = 0
+        self.gerados = 0        # Runs já gravados (numera os arquivos)
+
+    def gravar(self, registros):
+        """Grava um run com os registros, que já devem estar ordenados."""
+        caminho = os.path.join(self.diretorio, f"{self.prefixo}-{self.gerados}.run")
+        self.gerados += 1
+        with open(caminho, 'wb') as f:
+            lote = []
+            for registro in registros:
+                lote.append(registro)
+                if len(lote) == REGISTROS_POR_LOTE:
+                    pickle.dump(lote, f, pickle.HIGHEST_PROTOCOL)
+                    self.registros += len(lote)
+                    lote = []
+            if lote:
+                pickle.dump(lote, f, pickle.HIGHEST_PROTOCOL)
+                self.registros += len(lote)
+        self.caminhos.append(caminho)
+        instrumentacao.contar("externo.runs")
+
+    @staticmethod
+    def _ler(caminho):
+        with open(caminho, 'rb') as f:
+            while True:
+                try:
+                    lote = pickle.load(f)
+                except EOFError:
+                    return
+                yield from lote
+
+    def _compactar(self, combinar):
+        """Enquanto houver runs demais, intercala-os em grupos de MAXIMO_RUNS em runs maiores."""
+        while len(self.caminhos) > MAXIMO_RUNS:
+            grupos = [self.caminhos[i:i + MAXIMO_RUNS] for i in range(0, len(self.caminhos), MAXIMO_RUNS)]
+            self.caminhos, self.registros = [], 0
+            for grupo in grupos:
+                self.gravar(combinar(heapq.merge(*(self._ler(caminho) for caminho in grupo))))
+                for caminho in grupo:
+                    os.remove(caminho)
+
+    def intercalar(self):
+        """Registros de todos os runs em ordem (sem agregar)."""
+        self._compactar(iter)
+        return heapq.merge(*(self._ler(caminho) for caminho in self.caminhos))
+
+    @staticmethod
+    def _somar(registros):
+        """
+        Junta os registros (u, v, peso, ordem) de mesmo par, somando os pesos e
+        ficando com a menor ordem (primeira ocorrência).
+        """
+        for (u, v), grupo in groupby(registros, key=lambda r: (r[0], r[1])):
+            peso, ordem = 0, None
+            for _, _, p, o in grupo:
+                peso += p
+                if ordem is None or o < ordem:
+                    ordem = o
+            yield u, v, peso, ordem
+
+    def agregar(self):
+        """Gera (u, v, peso, ordem) por par, em ordem de (u, v), somando os runs."""
+        self._compactar(self._somar)
+        return self._somar(heapq.merge(*(self._ler(caminho) for caminho in self.caminhos)))
+
+
+class _Contador:
+    """
+    Counter de pares limitado: ao passar de `limite` pares distintos, despeja um
+    run. Os pares chegam na ordem do fluxo, então a ordem de inserção no Counter
+    é a da primeira ocorrência; cada registro leva (número do run, posição), que
+    ordena as primeiras ocorrências também entre runs diferentes.
+    """
+    def __init__(self, runs, limite):
+        self.runs = runs
+        self.limite = limite
+        self.contagem = Counter()
+
+    def somar(self, pares):
+        pares = iter(pares)
+        while True:
+            # Em partes, para um único título (ou ator) com muitos pares não estourar o limite
+            parte = list(islice(pares, REGISTROS_POR_LOTE))
+            if not parte:
+                return
+            self.contagem.update(parte)
+            if len(self.contagem) >= self.limite:
+                self.despejar()
+
+    def despejar(self):
+        if self.contagem:
+            run = self.runs.gerados
+            registros = [(u, v, c, (run, pos)) for pos, ((u, v), c) in enumerate(self.contagem.items())]
+            self.contagem = Counter()
+            registros.sort()
+            self.runs.gravar(registros)
+
+# ========== FASES ==========
+
+def _ler_pares(caminho_csv, tipo, contador, tamanho_bloco):
+    """
+    Lê o CSV em blocos e soma no contador os pares de cada título, na mesma
+    ordem dos construtores em memória.
+
+    No grafo de diretores, os pares são (ator, diretor) e as arestas só saem na
+    segunda fase (_pares_diretores); um ator de título sem diretores gera o par
+    (ator, '') para que a posição da sua primeira aparição não se perca.
+    """
+    titulos = total_linhas = 0
+    for elencos, diretores, linhas in iterar_blocos_padronizados(caminho_csv, tamanho_bloco):
+        total_linhas += linhas
+        titulos += len(elencos)
+        for elenco, diretores_filme in zip(elencos, diretores):
+            elenco = [sys.intern(nome) for nome in elenco]
+            diretores_filme = [sys.intern(nome) for nome in diretores_filme]
+            if tipo == 'atores':
+                contador.somar(combinations(sorted(elenco), 2))
+            elif tipo == 'direcional':
+                contador.somar(product(elenco, diretores_filme))
+            else:
+                contador.somar((ator, d) for ator in elenco for d in diretores_filme or ('',))
+    contador.despejar()
+    instrumentacao.informar(f"\n>>> Linhas processadas: {titulos} de {total_linhas} válidas.")
+
+
+def _pares_diretores(ator_diretor, contador, diretorio, limite):
+    """
+    Segunda fase do grafo de diretores: cada ator liga todos os diretores com quem
+    trabalhou. Os atores são reordenados (em runs) pela primeira aparição, a ordem
+    de ator_para_diretores em construir_grafo_participantes.
+    """
+    por_aparicao = _Runs(diretorio, "aparicoes")
+    lote = []
+    for _, grupo in groupby(ator_diretor.agregar(), key=lambda r: r[0]):
+        # O fluxo vem ordenado por (ator, diretor): os diretores já saem ordenados e sem repetição
+        grupo = list(grupo)
+        aparicao = min(ordem for _, _, _, ordem in grupo)
+        lote.append((aparicao, tuple(d for _, d, _, _ in grupo if d)))
+        if len(lote) >= limite:
+            lote.sort()
+            por_aparicao.gravar(lote)
+            lote = []
+    if lote:
+        lote.sort()
+        por_aparicao.gravar(lote)
+
+    for _, diretores in por_aparicao.intercalar():
+        contador.somar(combinations(diretores, 2))
+    contador.despejar()
+
+
+def _montar_csr(runs, direcionado, diretorio, limite, caminho_saida=None):
+    """
+    Monta o GrafoCSR a partir dos runs de pares (u, v) por nome. A primeira
+    passada agrega os pesos em um único run e coleta os nomes; a segunda traduz
+    para ids (ordem alfabética) e ordena, em runs próprios, as entradas
+    (origem, ordem, destino, peso) de cada sentido da aresta.
+    """
+    arestas = _Runs(diretorio, "arestas")
+    nomes = set()
+
+    def agregadas():
+        for u, v, peso, ordem in runs.agregar():
+            nomes.add(u)
+            nomes.add(v)
+            # Laço (nome repetido no elenco): mesmo peso 2c - 1 de construir_grafo_participantes
+            yield u, v, (2 * peso - 1 if u == v and not direcionado else peso), ordem
+
+    arestas.gravar(agregadas())
+    m = arestas.registros
+    nomes = sorted(nomes)
+    indice = {nome: i for i, nome in enumerate(nomes)}
+    n = len(nomes)
+
+    # Vizinhos de cada origem na ordem da primeira ocorrência do par
+    entradas = _Runs(diretorio, "entradas")
+    lote = []
+    for u, v, peso, ordem in arestas.intercalar():
+        iu, iv = indice[u], indice[v]
+        lote.append((iu, ordem, iv, peso))
+        if not direcionado and iu != iv:
+            lote.append((iv, ordem, iu, peso))
+        if len(lote) >= limite:
+            lote.sort()
+            entradas.gravar(lote)
+            lote = []
+    if lote:
+        lote.sort()
+        entradas.gravar(lote)
+
+    contagem = [0] * (n + 1)
+    if caminho_saida is None:
+        indices, pesos = array('i'), array('q')
+        for u, _, v, peso in entradas.intercalar():
+            contagem[u + 1] += 1
+            indices.append(v)
+            pesos.append(peso)
+    else:
+        # Índices e pesos vão direto para arquivos, em blocos
+        caminho_indices = os.path.join(diretorio, "indices.bin")
+        caminho_pesos = os.path.join(diretorio, "pesos.bin")
+        with open(caminho_indices, 'wb') as f_indices, open(caminho_pesos, 'wb') as f_pesos:
+            bloco_indices, bloco_pesos = array('i'), array('q')
+            for u, _, v, peso in entradas.intercalar():
+                contagem[u + 1] += 1
+                bloco_indices.append(v)
+                bloco_pesos.append(peso)
+                if len(bloco_indices) >= REGISTROS_POR_LOTE:
+                    bloco_indices.tofile(f_indices)
+                    bloco_pesos.tofile(f_pesos)
+                    bloco_indices, bloco_pesos = array('i'), array('q')
+            bloco_indices.tofile(f_indices)
+            bloco_pesos.tofile(f_pesos)
+
+    indptr = array('q', [0]) * (n + 1)
+    for i in range(n):
+        indptr[i + 1] = indptr[i] + contagem[i + 1]
+
+    if caminho_saida is None:
+        return GrafoCSR(nomes, indptr, indices, pesos, direcionado, m, indice=indice)
+
+    mapas = []
+    secoes = []
+    for caminho, formato in ((caminho_indices, 'i'), (caminho_pesos, 'q')):
+        if os.path.getsize(caminho) == 0:
+            secoes.append(array(formato))
+            continue
+        with open(caminho, 'rb') as f:
+            mapas.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        secoes.append(memoryview(mapas[-1]).cast(formato))
+    try:
+        salvar_csr(GrafoCSR(nomes, indptr, secoes[0], secoes[1], direcionado, m, indice=indice),
+                   caminho_saida)
+    finally:
+        for secao in secoes:
+            if isinstance(secao, memoryview):
+                secao.release()
+        for mapa in mapas:
+            mapa.close()
+    return abrir_csr(caminho_saida)
+
+
+def construir_externo(caminho_csv, tipo, memoria_mb=256, caminho_saida=None, tamanho_bloco=10_000,
+                      diretorio_temporario=None):
+    """
+    Constrói o grafo do tipo pedido sem manter os elencos nem a adjacência em
+    memória: mesmos vértices, arestas e pesos de construir_grafo_participantes e
+    construir_grafo_direcional, com os vizinhos na mesma ordem (o GrafoCSR é igual
+    ao de para_csr() do grafo construído em memória).
+
+    Args:
+        caminho_csv (str): Caminho para o arquivo CSV.
+        tipo (str): 'atores', 'diretores' ou 'direcional'.
+        memoria_mb (int): Orçamento aproximado, em MB, para os pares contados em
+            memória antes de cada despejo em disco.
+        caminho_saida (str, optional): Se informado, índices e pesos são gravados
+            direto neste arquivo .csr (formato do cache), que é aberto mapeado em
+            memória; senão o GrafoCSR é montado em arrays na memória.
+        tamanho_bloco (int): Linhas do CSV lidas por vez.
+        diretorio_temporario (str, optional): Onde ficam os runs (padrão: o do sistema).
+
+    Returns:
+        GrafoCSR
+    """
+    if tipo not in TIPOS:
+        raise ValueError("Tipo deve ser 'atores', 'diretores' ou 'direcional'")
+    limite_pares = max(1, memoria_mb * 2**20 // BYTES_POR_PAR)
+    limite_registros = max(1, memoria_mb * 2**20 // BYTES_POR_REGISTRO)
+
+    with tempfile.TemporaryDirectory(dir=diretorio_temporario) as diretorio, \
+            instrumentacao.fase("construcao_externa"):
+        runs = _Runs(diretorio, "pares")
+        with instrumentacao.fase("leitura"):
+            _ler_pares(caminho_csv, tipo, _Contador(runs, limite_pares), tamanho_bloco)
+        if tipo == 'diretores':
+            ator_diretor, runs = runs, _Runs(diretorio, "diretores")
+            with instrumentacao.fase("diretores"):
+                _pares_diretores(ator_diretor, _Contador(runs, limite_pares), diretorio, limite_registros)
+        instrumentacao.informar(f"Construção externa ({tipo}): {runs.registros} pares em "
+                                f"{len(runs.caminhos)} runs (orçamento de {memoria_mb} MB)")
+        with instrumentacao.fase("csr"):
+            return _montar_csr(runs, tipo == 'direcional', diretorio, limite_registros, caminho_saida)
+
+# ========== MAIN ==========
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(
+        description="Constrói um grafo a partir do CSV em blocos, com os pares ordenados em disco, "
+                    "e grava o resultado no formato .csr do cache.")
+    parser.add_argument("--csv", default="netflix_amazon_disney_titles.csv", help="Arquivo CSV de títulos.")
+    parser.add_argument("--graph", default="atores", choices=TIPOS, help="Tipo do grafo.")
+    parser.add_argument("--memoria-mb", type=int, default=256,
+                        help="Orçamento de memória para os pares antes de cada despejo (padrão: 256).")
+    parser.add_argument("--bloco", type=int, default=10_000, help="Linhas do CSV lidas por vez.")
+    parser.add_argument("--temporario", default=None, help="Diretório dos arquivos temporários.")
+    parser.add_argument("--saida", required=True, help="Arquivo .csr gerado.")
+    return parser.parse_args()
+
+
+def main():
+    args = ler_argumentos()
+    csr = construir_externo(args.csv, args.graph, args.memoria_mb, args.saida, args.bloco, args.temporario)
+    vertices, arestas = csr.obter_info()
+    print(f"Grafo de {args.graph} gravado em '{args.saida}': {vertices} vértices, {arestas} arestas.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import os
+
+import numpy as np
+
+import instrumentacao
+from algoritmos import _tarjan_iterativo
+from grafo import GrafoCSR
+
+# ========== DISTRIBUIÇÕES DE GRAU, FORÇA E COMPONENTES ==========
+#
+# Tudo é calculado sobre os vetores do GrafoCSR (indptr, indices, pesos) vistos
+# como arrays NumPy, sem cópia e sem dicionários por vértice: graus e forças são
+# diferenças e somas por linha, e as componentes saem de uma propagação de
+# rótulos vetorizada. Cada distribuição vira um histograma, uma CCDF em faixas
+# logarítmicas e um ajuste de lei de potência, exportáveis em CSV.
+
+BINS_POR_DECADA = 10
+MINIMO_CAUDA = 10       # Menor cauda (número de valores >= xmin) aceita no ajuste da lei de potência
+MAXIMO_CANDIDATOS = 200 # xmin testados no ajuste, espaçados geometricamente entre os valores distintos
+
+
+def _vetores(csr):
+    """indptr, indices e pesos do GrafoCSR como arrays NumPy (vistas sobre os mesmos buffers)."""
+    return np.asarray(csr.indptr), np.asarray(csr.indices), np.asarray(csr.pesos)
+
+
+# ---------- Vetores por vértice ----------
+
+def graus(grafo, mode="total"):
+    """
+    Grau de cada vértice (indexado pelo id do GrafoCSR), com o mesmo critério de
+    degree_centrality: no grafo direcionado, mode escolhe entrada ("in"), saída
+    ("out") ou a soma ("total").
+    """
+    csr = grafo.para_csr()
+    indptr, indices, _ = _vetores(csr)
+    saida = np.diff(indptr)
+    if not csr.direcionado or mode == "out":
+        return saida
+    entrada = np.bincount(indices, minlength=csr.n).astype(np.int64)
+    return entrada if mode == "in" else entrada + saida
+
+
+def forcas(grafo, mode="total"):
+    """Força (soma dos pesos das arestas) de cada vértice, com os mesmos modos de graus()."""
+    csr = grafo.para_csr()
+    indptr, _, pesos = _vetores(csr)
+    acumulado = np.concatenate(([0], np.cumsum(pesos)))
+    saida = acumulado[indptr[1:]] - acumulado[indptr[:-1]]
+    if not csr.direcionado or mode == "out":
+        return saida
+    # A força de entrada já é mantida pelo grafo: no Grafo, atualizada a cada
+    # aresta (forca_entrada); no GrafoCSR, somada pela transposta (forcas_entrada)
+    if isinstance(grafo, GrafoCSR):
+        entrada = np.asarray(csr.forcas_entrada(), dtype=pesos.dtype)
+    else:
+        entrada = np.fromiter((grafo.forca_entrada.get(v, 0) for v in csr.nomes), dtype=pesos.dtype, count=csr.n)
+    return entrada if mode == "in" else entrada + saida
+
+
+def rotulos_componentes(grafo):
+    """
+    Rótulo da componente de cada vértice (o menor id da componente), por propagação
+    vetorizada: a cada rodada, a raiz maior de cada aresta que liga raízes
+    diferentes é ligada à menor e os rótulos são comprimidos por saltos de
+    ponteiro. No grafo direcionado, são as componentes fracamente conexas.
+    """
+    csr = grafo.para_csr()
+    indptr, indices, _ = _vetores(csr)
+    rotulo = np.arange(csr.n)
+    origem = np.repeat(rotulo, np.diff(indptr))
+    destino = indices.astype(np.int64)
+
+    rodadas = 0
+    while True:
+        ru, rv = rotulo[origem], rotulo[destino]
+        cruzam = ru != rv
+        if not cruzam.any():
+            break
+        # Arestas dentro de uma mesma componente já fundida não mudam mais nada
+        origem, destino = origem[cruzam], destino[cruzam]
+        ru, rv = ru[cruzam], rv[cruzam]
+        np.minimum.at(rotulo, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            proximo = rotulo[rotulo]
+            if np.array_equal(proximo, rotulo):
+                break
+            rotulo = proximo
+        rodadas += 1
+
+    instrumentacao.contar("distribuicoes.rodadas_rotulos", rodadas)
+    return rotulo
+
+
+def tamanhos_componentes(grafo):
+    """
+    Ordem de cada componente: conexas no grafo não direcionado e fortemente
+    conexas (Tarjan) no direcionado, como no relatório de componentes.
+    """
+    csr = grafo.para_csr()
+    if csr.direcionado:
+        _, tamanhos = _tarjan_iterativo(csr)
+        return np.asarray(tamanhos, dtype=np.int64)
+    contagem = np.bincount(rotulos_componentes(csr), minlength=csr.n)
+    return contagem[contagem > 0]
+
+
+# ---------- Estatísticas de uma distribuição ----------
+
+def histograma(valores):
+    """Pares (valor, quantidade) de cada valor distinto, em ordem crescente de valor."""
+    valores = np.asarray(valores)
+    if np.issubdtype(valores.dtype, np.integer) and (not valores.size or valores.min() >= 0):
+        contagens = np.bincount(valores)
+        distintos = np.flatnonzero(contagens)
+        return distintos, contagens[distintos]
+    return np.unique(valores, return_counts=True)
+
+
+def ccdf_log(valores, bins_por_decada=BINS_POR_DECADA):
+    """
+    CCDF P(X >= x) dos valores positivos, avaliada em bordas espaçadas
+    logaritmicamente (bins_por_decada por potência de 10).
+
+    Returns:
+        tuple: (bordas, ccdf), arrays do mesmo tamanho.
+    """
+    x = np.sort(np.asarray(valores)[np.asarray(valores) > 0])
+    if not x.size:
+        return np.empty(0), np.empty(0)
+    inicio = np.floor(np.log10(x[0]) * bins_por_decada)
+    fim = np.ceil(np.log10(x[-1]) * bins_por_decada)
+    bordas = 10.0 ** (np.arange(inicio, fim + 1) / bins_por_decada)
+    if np.issubdtype(x.dtype, np.integer):
+        # Entre dois inteiros a CCDF não muda: basta avaliar cada inteiro uma vez
+        bordas = np.unique(np.ceil(bordas))
+    ccdf = (x.size - np.searchsorted(x, bordas, side='left')) / x.size
+    manter = ccdf > 0
+    return bordas[manter], ccdf[manter]
+
+
+def _ajuste_cauda(distintos, contagens, xmin, discreto):
+    """Expoente (máxima verossimilhança) e distância KS da cauda com valores >= xmin."""
+    n = contagens.sum()
+    base = xmin - 0.5 if discreto else xmin
+    denominador = (contagens * np.log(distintos / base)).sum()
+    if denominador <= 0:
+        return None, None
+    alfa = 1 + n / denominador
+    # Variável discreta vista como a contínua arredondada: P(X <= x) = P(Y < x + 0.5)
+    limite = distintos + 0.5 if discreto else distintos
+    modelo = 1 - (limite / base) ** (1 - alfa)
+    empirica = np.cumsum(contagens) / n
+    return alfa, float(np.abs(empirica - modelo).max())
+
+
+def ajustar_lei_potencia(valores, xmin=None, minimo_cauda=MINIMO_CAUDA):
+    """
+    Ajusta P(x) ~ x^-alfa à cauda x >= xmin dos valores positivos, por máxima
+    verossimilhança (Clauset, Shalizi e Newman; aproximação discreta para valores
+    inteiros). Sem xmin, escolhe o que minimiza a distância de Kolmogorov-Smirnov
+    entre a cauda e o modelo, entre os que deixam ao menos minimo_cauda valores.
+
+    Returns:
+        dict com 'alfa', 'erro' (desvio padrão de alfa), 'xmin', 'n_cauda' e 'ks',
+        ou None se não houver cauda suficiente (ao menos dois valores distintos).
+    """
+    valores = np.asarray(valores)
+    distintos, contagens = histograma(valores[valores > 0])
+    discreto = np.issubdtype(valores.dtype, np.integer)
+    cauda = np.cumsum(contagens[::-1])[::-1]            # quantos valores >= cada distinto
+
+    if xmin is not None:
+        candidatos = [int(np.searchsorted(distintos, xmin))]
+    else:
+        candidatos = np.flatnonzero(cauda >= minimo_cauda)
+        if candidatos.size > MAXIMO_CANDIDATOS:
+            posicoes = np.geomspace(1, candidatos.size, MAXIMO_CANDIDATOS).astype(np.int64) - 1
+            candidatos = candidatos[np.unique(posicoes)]
+
+    melhor = None
+    for i in candidatos:
+        if i >= distintos.size - 1:
+            continue    # Cauda com um só valor distinto não determina o expoente
+        x0 = xmin if xmin is not None else distintos[i]
+        alfa, ks = _ajuste_cauda(distintos[i:], contagens[i:], x0, discreto)
+        if alfa is not None and (melhor is None or ks < melhor['ks']):
+            n = int(cauda[i])
+            melhor = {'alfa': float(alfa), 'erro': float((alfa - 1) / np.sqrt(n)),
+                      'xmin': x0.item() if hasattr(x0, 'item') else x0, 'n_cauda': n, 'ks': ks}
+    return melhor
+
+
+def analisar(valores, bins_por_decada=BINS_POR_DECADA):
+    """Histograma, CCDF logarítmica, ajuste de lei de potência e resumo de um vetor de valores."""
+    valores = np.asarray(valores)
+    return {
+        'valores': valores,
+        'n': int(valores.size),
+        'media': float(valores.mean()) if valores.size else 0.0,
+        'maximo': valores.max().item() if valores.size else 0,
+        'histograma': histograma(valores),
+        'ccdf': ccdf_log(valores, bins_por_decada),
+        'lei_potencia': ajustar_lei_potencia(valores),
+    }
+
+
+def distribuicoes(grafo, bins_por_decada=BINS_POR_DECADA):
+    """
+    Distribuições de grau, força e ordem das componentes de um grafo.
+
+    Returns:
+        dict: nome -> resultado de analisar(). Nomes: 'grau', 'forca' e
+        'componentes' no grafo não direcionado; 'grau_entrada', 'grau_saida',
+        'forca_entrada', 'forca_saida' e 'componentes' (fortemente conexas) no
+        direcionado.
+    """
+    instrumentacao.informar("Calculando distribuições de grau, força e componentes...")
+    csr = grafo.para_csr()
+    with instrumentacao.fase("distribuicoes"):
+        if csr.direcionado:
+            vetores = {
+                'grau_entrada': graus(csr, "in"),
+                'grau_saida': graus(csr, "out"),
+                'forca_entrada': forcas(grafo, "in"),
+                'forca_saida': forcas(csr, "out"),
+            }
+        else:
+            vetores = {'grau': graus(csr), 'forca': forcas(csr)}
+        vetores['componentes'] = tamanhos_componentes(csr)
+        return {nome: analisar(v, bins_por_decada) for nome, v in vetores.items()}
+
+
+# ---------- Exportação ----------
+
+def _formato(valores):
+    return '%d' if np.issubdtype(np.asarray(valores).dtype, np.integer) else '%.10g'
+
+
+def exportar_csv(resultado, diretorio, prefixo):
+    """
+    Grava, para cada distribuição de distribuicoes(), <prefixo>_<nome>_histograma.csv
+    (valor, quantidade) e <prefixo>_<nome>_ccdf.csv (x, ccdf), além de
+    <prefixo>_lei_potencia.csv com os ajustes. Retorna a lista de arquivos gravados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    arquivos = []
+
+    def gravar(nome, colunas, cabecalho, formatos):
+        caminho = os.path.join(diretorio, f"{prefixo}_{nome}.csv")
+        np.savetxt(caminho, np.column_stack(colunas) if len(colunas[0]) else np.empty((0, len(colunas))),
+                   fmt=formatos, delimiter=',', header=cabecalho, comments='', encoding='utf-8')
+        arquivos.append(caminho)
+
+    for nome, dist in resultado.items():
+        distintos, contagens = dist['histograma']
+        gravar(f"{nome}_histograma", [distintos, contagens], "valor,quantidade", [_formato(distintos), '%d'])
+        bordas, ccdf = dist['ccdf']
+        gravar(f"{nome}_ccdf", [bordas, ccdf], "x,ccdf", ['%.10g', '%.10g'])
+
+    caminho = os.path.join(diretorio, f"{prefixo}_lei_potencia.csv")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write("distribuicao,alfa,erro,xmin,n_cauda,ks\n")
+        for nome, dist in resultado.items():
+            ajuste = dist['lei_potencia']
+            if ajuste is None:
+                f.write(f"{nome},,,,,\n")
+            else:
+                f.write(f"{nome},{ajuste['alfa']:.6f},{ajuste['erro']:.6f},{ajuste['xmin']},"
+                        f"{ajuste['n_cauda']},{ajuste['ks']:.6f}\n")
+    arquivos.append(caminho)
+    return arquivos
@@ -1,48 +1,88 @@
+import hashlib
+import sys
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Mapping, Sequence
+from itertools import accumulate, chain, combinations, product
 
-def carregar_dados_padronizados(caminho_arquivo):
+# Tipos de grafo construídos a partir do catálogo
+TIPOS = ('atores', 'diretores', 'direcional')
+
+
+def _padronizar_nomes(coluna):
+    """
+    Separa uma coluna de nomes por vírgula e padroniza cada nome (sem espaços nas
+    pontas, em maiúsculas), com operações vetorizadas. Retorna uma Series com um
+    nome por linha, indexada pela linha de origem; nomes vazios são descartados.
+    """
+    nomes = coluna.str.split(',').explode().str.strip().str.upper()
+    return nomes[nomes != '']
+
+
+def _agrupar_por_linha(nomes):
+    """
+    Reagrupa a Series gerada por _padronizar_nomes em listas de nomes por linha.
+    Retorna (linhas, listas), na ordem original do arquivo.
+    """
+    if nomes.empty:
+        return [], []
+    linhas = nomes.index.to_numpy()
+    valores = nomes.tolist()
+    inicios = np.flatnonzero(np.r_[True, linhas[1:] != linhas[:-1]]).tolist()
+    fins = inicios[1:] + [len(valores)]
+    return linhas[inicios].tolist(), [valores[a:b] for a, b in zip(inicios, fins)]
+
+
+def iterar_blocos_padronizados(caminho_arquivo, tamanho_bloco=None):
+    """
+    Lê apenas as colunas 'cast' e 'director' do CSV, em blocos, e gera para cada
+    bloco a tupla (elencos, diretores, linhas_validas).
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo CSV.
+        tamanho_bloco (int, optional): Linhas por bloco. Se None, lê tudo de uma vez.
+    """
+    leitura = pd.read_csv(caminho_arquivo, usecols=['cast', 'director'], dtype=str,
+                          chunksize=tamanho_bloco)
+    blocos = [leitura] if tamanho_bloco is None else leitura
+
+    for df in blocos:
+        # Filtra linhas com valores não nulos em 'cast' e 'director'
+        df = df[df['cast'].notnull() & df['director'].notnull()]
+
+        # Reagrupa os nomes por linha, mantendo a ordem; linhas sem atores somem aqui
+        linhas, elencos = _agrupar_por_linha(_padronizar_nomes(df['cast']))
+        diretores_por_linha = dict(zip(*_agrupar_por_linha(_padronizar_nomes(df['director']))))
+        diretores = [diretores_por_linha.get(linha, []) for linha in linhas]
+        yield elencos, diretores, len(df)
+
+
+def carregar_dados_padronizados(caminho_arquivo, tamanho_bloco=None):
     """
     Carrega e padroniza os dados do CSV, filtrando apenas linhas com 'cast' e 'director' válidos.
 
     Args:
         caminho_arquivo (str): Caminho para o arquivo CSV.
+        tamanho_bloco (int, optional): Se informado, lê o arquivo em blocos com esse número de linhas.
 
     Returns:
         tuple: (elencos, diretores), listas de listas com atores e diretores padronizados.
     """
+    total_linhas = 0
+    elencos, diretores = [], []
+
     try:
-        df = pd.read_csv(caminho_arquivo)
+        for elencos_bloco, diretores_bloco, linhas in iterar_blocos_padronizados(caminho_arquivo, tamanho_bloco):
+            elencos.extend(elencos_bloco)
+            diretores.extend(diretores_bloco)
+            total_linhas += linhas
     except Exception as e:
         print(f"Erro ao ler o CSV: {e}")
         return [], []
 
-    # Filtra linhas com valores não nulos em 'cast' e 'director'
-    df = df[df['cast'].notnull() & df['director'].notnull()]
-
-    total_linhas = len(df)
-    linhas_processadas = 0
-    elencos, diretores = [], []
-
-    for _, linha in df.iterrows():
-        elenco_raw = linha['cast']
-        diretor_raw = linha['director']
-
-        # Padronizar nomes dos atores
-        atores = [ator.strip().upper() for ator in elenco_raw.split(',') if ator.strip()]
-        if len(atores) == 0:
-            continue  # Ignora se não houver nenhum ator
-
-        # Padronizar nomes dos diretores,
-        
-        diretores_padronizados = [d.strip().upper() for d in diretor_raw.split(',') if d.strip()]
-        # Não exige mais diretores obrigatórios
-
-        elencos.append(atores)
-        diretores.append(diretores_padronizados)
-        linhas_processadas += 1
-
-    print(f"\n>>> Linhas processadas: {linhas_processadas} de {total_linhas} válidas.")
+    print(f"\n>>> Linhas processadas: {len(elencos)} de {total_linhas} válidas.")
 
     return elencos, diretores
 
@@ -52,20 +92,30 @@ class Grafo:
     Estrutura de Grafo com suporte a grafos direcionados e não direcionados.
     """
     def __init__(self, direcionado=False):
-        self.lista_adj = defaultdict(list)  # Lista de adjacência
+        self.lista_adj = defaultdict(dict)  # Lista de adjacência: vértice -> {vizinho: peso}
         self.vertices = set()               # Conjunto de vértices
         self.direcionado = direcionado
         self.num_arestas = 0
+        self._csr = None                    # Cache da forma compacta (GrafoCSR)
+        # Adjacência reversa: vértice -> {origem: peso}. No grafo não direcionado
+        # é a própria lista_adj.
+        self.lista_adj_reversa = defaultdict(dict) if direcionado else self.lista_adj
+        # Soma dos pesos das arestas que chegam em cada vértice (no grafo não
+        # direcionado, a força do vértice)
+        self.forca_entrada = defaultdict(int)
 
     def adicionar_vertice(self, v):
         """Adiciona um vértice ao grafo."""
         self.vertices.add(v)
+        self._csr = None
 
     def adicionar_aresta(self, u, v, peso=1):
         """
         Adiciona uma aresta entre os vértices u e v.
 
         Se o grafo for não-direcionado, adiciona a aresta nos dois sentidos.
+        Se a aresta já existir, soma o peso. Ambos os casos são O(1), pois a
+        adjacência de cada vértice é um dicionário indexado pelo vizinho.
 
         Args:
             u (str): Vértice de origem.
@@ -73,25 +123,84 @@ class Grafo:
             peso (int, optional): Peso da aresta. Default é 1.
         """
         self.vertices.update([u, v])
+        self._csr = None
+
+        adj_u = self.lista_adj[u]
+        if self.direcionado:
+            if v in adj_u:
+                adj_u[v] += peso
+                self.lista_adj_reversa[v][u] += peso
+            else:
+                adj_u[v] = peso
+                self.lista_adj_reversa[v][u] = peso
+                self.num_arestas += 1
+            self.forca_entrada[v] += peso
+            return
 
-        # Verifica se a aresta já existe para somar peso
-        for idx, (viz, peso_atual) in enumerate(self.lista_adj[u]):
-            if viz == v:
-                self.lista_adj[u][idx] = (viz, peso_atual + peso)
-                if not self.direcionado:
-                    for jdx, (viz2, peso_atual2) in enumerate(self.lista_adj[v]):
-                        if viz2 == u:
-                            self.lista_adj[v][jdx] = (viz2, peso_atual2 + peso)
-                return
+        adj_v = self.lista_adj[v]
+        if v in adj_u:
+            # A aresta já existe: soma o peso nos dois sentidos
+            adj_u[v] += peso
+            self.forca_entrada[u] += peso
+            if u in adj_v:
+                adj_v[u] += peso
+                self.forca_entrada[v] += peso
+            return
 
         # Se a aresta ainda não existe, cria
-        self.lista_adj[u].append((v, peso))
+        adj_u[v] = peso
+        self.forca_entrada[u] += peso
         self.num_arestas += 1
 
-        if not self.direcionado:
-            # Adiciona a aresta inversa se ainda não existir
-            if not any(viz == u for viz, _ in self.lista_adj[v]):
-                self.lista_adj[v].append((u, peso))
+        # Adiciona a aresta inversa se ainda não existir
+        if u not in adj_v:
+            adj_v[u] = peso
+            self.forca_entrada[v] += peso
+
+    @classmethod
+    def de_contagens(cls, contagens, direcionado=False):
+        """
+        Constrói o grafo de uma só vez a partir dos pesos já agregados.
+
+        Args:
+            contagens (dict): {(u, v): peso}. Em grafo não direcionado, cada par
+                deve aparecer uma única vez, em qualquer um dos sentidos.
+            direcionado (bool): Se o grafo é direcionado.
+        """
+        grafo = cls(direcionado=direcionado)
+        lista_adj, reversa, forca = grafo.lista_adj, grafo.lista_adj_reversa, grafo.forca_entrada
+        for (u, v), peso in contagens.items():
+            lista_adj[u][v] = peso
+            forca[v] += peso
+            if direcionado:
+                reversa[v][u] = peso
+            elif u != v:
+                lista_adj[v][u] = peso
+                forca[u] += peso
+        grafo.vertices.update(u for u, _ in contagens)
+        grafo.vertices.update(v for _, v in contagens)
+        grafo.num_arestas = len(contagens)
+        return grafo
+
+    @classmethod
+    def de_csr(cls, csr):
+        """Reconstrói o Grafo (modificável) a partir de um GrafoCSR, por exemplo um aberto do cache."""
+        contagens = {}
+        nomes, indptr, indices, pesos = csr.nomes, csr.indptr, csr.indices, csr.pesos
+        for u in range(csr.n):
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if csr.direcionado or u <= v:
+                    contagens[(nomes[u], nomes[v])] = pesos[k]
+        return cls.de_contagens(contagens, direcionado=csr.direcionado)
+
+    def grau_entrada(self, v):
+        """Número de arestas que chegam em v (no grafo não direcionado, o grau)."""
+        return len(self.lista_adj_reversa.get(v, ()))
+
+    def grau_saida(self, v):
+        """Número de arestas que saem de v (no grafo não direcionado, o grau)."""
+        return len(self.lista_adj.get(v, ()))
 
     def obter_info(self):
         """Retorna o número de vértices e de arestas do grafo."""
@@ -106,39 +215,196 @@ class Grafo:
         saida += f"Vértices: {len(self.vertices)}, Arestas: {self.num_arestas if self.direcionado else self.num_arestas }\n"
 
         for vertice in sorted(self.vertices):
-            vizinhos = ", ".join(f"{v}({p})" for v, p in self.lista_adj[vertice])
+            vizinhos = ", ".join(f"{v}({p})" for v, p in self.lista_adj[vertice].items())
+            saida += f"{vertice}: {vizinhos}\n"
+
+        return saida
+
+    def para_csr(self):
+        """
+        Retorna a forma compacta (GrafoCSR) do grafo.
+
+        O resultado fica em cache até a próxima modificação do grafo.
+        """
+        if self._csr is None:
+            self._csr = GrafoCSR.de_grafo(self)
+        return self._csr
+
+
+class GrafoCSR:
+    """
+    Representação compacta e imutável (compressed sparse row) de um Grafo.
+
+    Cada vértice recebe um id inteiro de 0 a n-1 (na ordem alfabética dos nomes).
+    Os vizinhos do vértice i são indices[indptr[i]:indptr[i + 1]], com os pesos
+    correspondentes em pesos[indptr[i]:indptr[i + 1]]. A tabela `nomes`/`indice`
+    traduz entre id e nome, mantendo disponível a API baseada em nomes.
+    """
+    def __init__(self, nomes, indptr, indices, pesos, direcionado=False, num_arestas=0, indice=None):
+        self.nomes = nomes                  # id -> nome
+        if indice is None:
+            indice = {nome: i for i, nome in enumerate(nomes)}
+        self.indice = indice                # nome -> id
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.direcionado = direcionado
+        self.num_arestas = num_arestas
+        self._transposta = None
+        self._impressao = None              # Cache de impressao_digital()
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """Congela um Grafo na forma CSR, preservando a ordem das listas de adjacência."""
+        nomes = sorted(sys.intern(v) for v in grafo.vertices)
+        indice = {nome: i for i, nome in enumerate(nomes)}
+
+        inteiros = all(type(p) is int for adj in grafo.lista_adj.values() for p in adj.values())
+        indptr = array('q', [0])
+        indices = array('i')
+        pesos = array('q' if inteiros else 'd')
+
+        for nome in nomes:
+            for viz, peso in grafo.lista_adj.get(nome, {}).items():
+                indices.append(indice[viz])
+                pesos.append(peso)
+            indptr.append(len(indices))
+
+        return cls(nomes, indptr, indices, pesos, grafo.direcionado, grafo.num_arestas)
+
+    @property
+    def vertices(self):
+        """Visão (tipo conjunto) dos nomes dos vértices."""
+        return self.indice.keys()
+
+    @property
+    def n(self):
+        return len(self.nomes)
+
+    def vizinhos(self, v):
+        """Retorna a lista de (vizinho, peso) do vértice de nome v."""
+        i = self.indice.get(v)
+        if i is None:
+            return []
+        ini, fim = self.indptr[i], self.indptr[i + 1]
+        return [(self.nomes[j], p) for j, p in zip(self.indices[ini:fim], self.pesos[ini:fim])]
+
+    def impressao_digital(self):
+        """Hash SHA-256 da estrutura (nomes, arestas e pesos), calculado uma vez por grafo."""
+        if self._impressao is None:
+            h = hashlib.sha256()
+            h.update(b'D' if self.direcionado else b'N')
+            h.update('\0'.join(self.nomes).encode('utf-8'))
+            for arr in (self.indptr, self.indices, self.pesos):
+                h.update(memoryview(arr).cast('B'))
+            self._impressao = h.hexdigest()
+        return self._impressao
+
+    def grau(self, i):
+        """Grau (de saída, se direcionado) do vértice de id i."""
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def transposta(self):
+        """
+        Retorna o grafo com as arestas invertidas (adjacência reversa), construído
+        em O(V + E) por contagem e mantido em cache. Compartilha a tabela de nomes.
+        No grafo não direcionado, é o próprio grafo.
+        """
+        if not self.direcionado:
+            return self
+        if self._transposta is None:
+            n, indptr, indices, pesos = self.n, self.indptr, self.indices, self.pesos
+
+            contagem = [0] * (n + 1)
+            for w in indices:
+                contagem[w + 1] += 1
+            indptr_t = array('q', accumulate(contagem))
+
+            proximo = list(indptr_t[:-1])
+            indices_t = array('i', [0]) * len(indices)
+            tipo_pesos = getattr(pesos, 'typecode', None) or pesos.format  # array ou memoryview
+            pesos_t = array(tipo_pesos, [0]) * len(pesos)
+            for u in range(n):
+                for k in range(indptr[u], indptr[u + 1]):
+                    w = indices[k]
+                    pos = proximo[w]
+                    indices_t[pos] = u
+                    pesos_t[pos] = pesos[k]
+                    proximo[w] = pos + 1
+
+            self._transposta = GrafoCSR(self.nomes, indptr_t, indices_t, pesos_t,
+                                        True, self.num_arestas, indice=self.indice)
+            self._transposta._transposta = self
+        return self._transposta
+
+    def graus_entrada(self):
+        """Lista com o grau de entrada de cada id (no grafo não direcionado, o grau)."""
+        indptr = self.transposta().indptr
+        return [indptr[i + 1] - indptr[i] for i in range(self.n)]
+
+    def forcas_entrada(self):
+        """Lista com a soma dos pesos que chegam em cada id."""
+        t = self.transposta()
+        return [sum(t.pesos[t.indptr[i]:t.indptr[i + 1]]) for i in range(self.n)]
+
+    def para_csr(self):
+        return self
+
+    def obter_info(self):
+        """Retorna o número de vértices e de arestas do grafo."""
+        return self.n, self.num_arestas
+
+    def __str__(self):
+        """Gera uma representação textual do grafo (mesmo formato de Grafo)."""
+        tipo = "direcionado" if self.direcionado else "não direcionado"
+        saida = f"Grafo {tipo}\n"
+        saida += f"Vértices: {self.n}, Arestas: {self.num_arestas}\n"
+
+        for vertice in self.nomes:
+            vizinhos = ", ".join(f"{v}({p})" for v, p in self.vizinhos(vertice))
             saida += f"{vertice}: {vizinhos}\n"
 
         return saida
 
 
+def _contar_pares(grupos):
+    """
+    Conta, em uma única passada, quantas vezes cada par não ordenado de nomes
+    aparece junto em um mesmo grupo. Retorna um Counter {(u, v): vezes} com u <= v.
+    """
+    contagem = Counter()
+    for grupo in grupos:
+        contagem.update(combinations(sorted(grupo), 2))
+    return contagem
+
+
 def construir_grafo_participantes(elencos, diretores, tipo='atores'):
     """
     Constrói um grafo não direcionado entre atores ou entre diretores.
     - tipo='atores': grafo de atores (vértices = atores, arestas = atuaram juntos)
     - tipo='diretores': grafo de diretores (vértices = diretores, arestas = dirigiram o mesmo ator)
+
+    Os pesos de todos os pares são contados de uma vez e o grafo é montado em um
+    único passo, com o mesmo resultado de chamar adicionar_aresta par a par.
     """
-    grafo = Grafo(direcionado=False)
     if tipo == 'atores':
-        for elenco in elencos:
-            for i in range(len(elenco)):
-                for j in range(i + 1, len(elenco)):
-                    grafo.adicionar_aresta(elenco[i], elenco[j], 1)
+        contagem = _contar_pares(elencos)
     elif tipo == 'diretores':
-        from collections import defaultdict
         ator_para_diretores = defaultdict(set)
         for elenco, diretores_filme in zip(elencos, diretores):
             for ator in elenco:
-                for diretor in diretores_filme:
-                    ator_para_diretores[ator].add(diretor)
-        for diretores_set in ator_para_diretores.values():
-            diretores_list = list(diretores_set)
-            for i in range(len(diretores_list)):
-                for j in range(i + 1, len(diretores_list)):
-                    grafo.adicionar_aresta(diretores_list[i], diretores_list[j], 1)
+                ator_para_diretores[ator].update(diretores_filme)
+        contagem = _contar_pares(ator_para_diretores.values())
     else:
         raise ValueError("Tipo deve ser 'atores' ou 'diretores'")
-    return grafo
+
+    # Um nome repetido no mesmo elenco gera laço (u, u); adicionar_aresta soma o
+    # peso do laço duas vezes a cada repetição, então o peso final é 2c - 1.
+    for par, vezes in contagem.items():
+        if par[0] == par[1]:
+            contagem[par] = 2 * vezes - 1
+
+    return Grafo.de_contagens(contagem, direcionado=False)
 
 def construir_grafo_direcional(elencos, diretores):
     """
@@ -146,15 +412,165 @@ def construir_grafo_direcional(elencos, diretores):
     Vértices: atores e diretores.
     Arestas: de cada ator para cada diretor do mesmo filme.
     """
-    grafo = Grafo(direcionado=True)
+    contagem = Counter()
     for elenco, diretores_filme in zip(elencos, diretores):
-        for ator in elenco:
-            for diretor in diretores_filme:
-                grafo.adicionar_aresta(ator, diretor, 1)
-    return grafo
+        contagem.update(product(elenco, diretores_filme))
+    return Grafo.de_contagens(contagem, direcionado=True)
+
+# ========== CONSTRUÇÃO CONJUNTA DOS TRÊS GRAFOS ==========
+
+class TabelaNomes:
+    """
+    Tabela de nomes internados compartilhada por vários GrafoCSR: cada nome tem
+    um id global (na ordem alfabética) e é armazenado uma única vez.
+    """
+    def __init__(self, nomes):
+        self.nomes = nomes                                          # id global -> nome
+        self.indice = {nome: i for i, nome in enumerate(nomes)}    # nome -> id global
+
+    def __len__(self):
+        return len(self.nomes)
+
+
+class _NomesLocais(Sequence):
+    """id local -> nome, através do id global na TabelaNomes (sem copiar os nomes)."""
+    def __init__(self, tabela, globais):
+        self.tabela = tabela
+        self.globais = globais          # id local -> id global
+
+    def __len__(self):
+        return len(self.globais)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.tabela.nomes[g] for g in self.globais[i]]
+        return self.tabela.nomes[self.globais[i]]
+
+    def __iter__(self):
+        nomes = self.tabela.nomes
+        return (nomes[g] for g in self.globais)
+
+
+class _IndiceLocal(Mapping):
+    """nome -> id local, através do id global na TabelaNomes."""
+    def __init__(self, tabela, globais):
+        self.tabela = tabela
+        self.globais = globais
+        self.locais = array('i', [-1]) * len(tabela)   # id global -> id local (-1: fora do grafo)
+        for local, g in enumerate(globais):
+            self.locais[g] = local
+
+    def __getitem__(self, nome):
+        local = self.locais[self.tabela.indice[nome]]
+        if local < 0:
+            raise KeyError(nome)
+        return local
+
+    def __len__(self):
+        return len(self.globais)
+
+    def __iter__(self):
+        nomes = self.tabela.nomes
+        return (nomes[g] for g in self.globais)
+
+
+def _csr_de_contagens(contagens, direcionado, tabela, novo_id):
+    """
+    Monta um GrafoCSR sobre a TabelaNomes a partir de {(u, v): peso} com ids
+    provisórios (traduzidos para ids globais pelo vetor novo_id).
+    """
+    m = len(contagens)
+    pares = np.fromiter(chain.from_iterable(contagens), dtype=np.int64, count=2 * m).reshape(m, 2)
+    peso = np.fromiter(contagens.values(), dtype=np.int64, count=m)
+    pares = novo_id[pares]
+
+    # Ids locais: posição do id global entre os vértices presentes (ordem alfabética)
+    globais = np.unique(pares)
+    origem = np.searchsorted(globais, pares[:, 0])
+    destino = np.searchsorted(globais, pares[:, 1])
+    if not direcionado:
+        volta = origem != destino
+        origem, destino = np.concatenate([origem, destino[volta]]), np.concatenate([destino, origem[volta]])
+        peso = np.concatenate([peso, peso[volta]])
+
+    n = len(globais)
+    ordem = np.argsort(origem, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origem, minlength=n), out=indptr[1:])
+
+    globais = array('i', globais.astype(np.int32).tobytes())
+    return GrafoCSR(_NomesLocais(tabela, globais),
+                    array('q', indptr.tobytes()),
+                    array('i', destino[ordem].astype(np.int32).tobytes()),
+                    array('q', peso[ordem].tobytes()),
+                    direcionado, m, indice=_IndiceLocal(tabela, globais))
+
+
+def construir_todos_grafos(elencos, diretores):
+    """
+    Constrói os três grafos (atores, diretores e direcional) percorrendo os dados
+    uma única vez. Os grafos saem como GrafoCSR sobre uma mesma TabelaNomes, de
+    modo que cada nome é armazenado uma só vez. Os vértices, arestas e pesos são
+    os mesmos de construir_grafo_participantes e construir_grafo_direcional.
+
+    Returns:
+        tuple: ({'atores': GrafoCSR, 'diretores': GrafoCSR, 'direcional': GrafoCSR}, tabela)
+    """
+    provisorio = {}                     # nome -> id provisório (ordem de aparição)
+    pares_atores, pares_direcional = Counter(), Counter()
+    ator_para_diretores = defaultdict(set)
+
+    for elenco, diretores_filme in zip(elencos, diretores):
+        ids_elenco = sorted(provisorio.setdefault(sys.intern(a), len(provisorio)) for a in elenco)
+        ids_diretores = [provisorio.setdefault(sys.intern(d), len(provisorio)) for d in diretores_filme]
+        pares_atores.update(combinations(ids_elenco, 2))
+        pares_direcional.update(product(ids_elenco, ids_diretores))
+        for ator in ids_elenco:
+            ator_para_diretores[ator].update(ids_diretores)
+
+    pares_diretores = Counter()
+    for ids in ator_para_diretores.values():
+        pares_diretores.update(combinations(sorted(ids), 2))
+
+    # Mesmo peso de laço que construir_grafo_participantes (nome repetido no elenco)
+    for par, vezes in pares_atores.items():
+        if par[0] == par[1]:
+            pares_atores[par] = 2 * vezes - 1
+
+    # Ids globais em ordem alfabética, como em GrafoCSR.de_grafo
+    nomes = sorted(provisorio)
+    tabela = TabelaNomes(nomes)
+    novo_id = np.empty(len(nomes), dtype=np.int64)
+    for nome, i in provisorio.items():
+        novo_id[i] = tabela.indice[nome]
+    del provisorio
+
+    grafos = {
+        'atores': _csr_de_contagens(pares_atores, False, tabela, novo_id),
+        'diretores': _csr_de_contagens(pares_diretores, False, tabela, novo_id),
+        'direcional': _csr_de_contagens(pares_direcional, True, tabela, novo_id),
+    }
+    return grafos, tabela
+
+
+def memoria_grafos(grafos, tabela):
+    """
+    Memória aproximada (em bytes) de cada grafo e da tabela de nomes compartilhada.
+    Retorna {nome: {'arestas': ..., 'indices_nomes': ..., 'total': ...}}, com a
+    tabela em 'tabela_compartilhada'.
+    """
+    relatorio = {}
+    for tipo, csr in grafos.items():
+        arestas = sum(sys.getsizeof(a) for a in (csr.indptr, csr.indices, csr.pesos))
+        mapeamento = sys.getsizeof(csr.nomes.globais) + sys.getsizeof(csr.indice.locais)
+        relatorio[tipo] = {'arestas': arestas, 'indices_nomes': mapeamento, 'total': arestas + mapeamento}
+    nomes = sys.getsizeof(tabela.nomes) + sum(sys.getsizeof(nome) for nome in tabela.nomes)
+    indice = sys.getsizeof(tabela.indice)
+    relatorio['tabela_compartilhada'] = {'nomes': nomes, 'indice': indice, 'total': nomes + indice}
+    return relatorio
+
 
 # Exemplo de uso:
 # grafo_atores = construir_grafo_participantes(elencos, diretores, tipo='atores')
 # grafo_diretores = construir_grafo_participantes(elencos, diretores, tipo='diretores')
 # grafo_direcional = construir_grafo_direcional(elencos, diretores)
-
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from itertools import combinations, product
+
+from grafo import TIPOS, Grafo, GrafoCSR
+from algoritmos import UniaoBusca
+
+# ========== ATUALIZAÇÃO INCREMENTAL ==========
+#
+# Novos títulos são somados a um Grafo já construído, aresta a aresta, sem reler
+# o CSV: o resultado é o mesmo de construir o grafo com todos os títulos.
+# Componentes (via union-find) e graus são mantidos junto, e as centralidades
+# que dependem do grafo inteiro ficam marcadas como desatualizadas.
+
+
+def _padronizar(nomes):
+    """Mesma padronização do carregamento: sem espaços nas pontas, maiúsculas, sem vazios."""
+    padronizados = (nome.strip().upper() for nome in nomes)
+    return [nome for nome in padronizados if nome]
+
+
+class CatalogoIncremental:
+    """
+    Mantém um grafo de um tipo ('atores', 'diretores' ou 'direcional') atualizado
+    conforme novos títulos chegam.
+
+    Args:
+        grafo (Grafo ou GrafoCSR): Grafo já construído com os títulos atuais. Um
+            GrafoCSR (por exemplo, aberto do cache) é convertido em Grafo.
+        tipo (str): Tipo do grafo.
+        elencos, diretores (list, optional): Títulos já contidos no grafo. Só são
+            necessários no grafo de diretores, cujas arestas dependem de todos os
+            diretores com quem cada ator já trabalhou.
+        cache (CacheResultados, optional): Se informado, os resultados do grafo
+            antigo são descartados a cada atualização.
+
+    Componentes: no grafo direcionado, são as fracamente conexas.
+    """
+    def __init__(self, grafo, tipo, elencos=(), diretores=(), cache=None):
+        if tipo not in TIPOS:
+            raise ValueError("Tipo deve ser 'atores', 'diretores' ou 'direcional'")
+        # Impressão digital da forma compacta atual, sob a qual os resultados do
+        # grafo recebido estão no cache (o Grafo convertido ainda não tem _csr)
+        self._impressao = None
+        if isinstance(grafo, GrafoCSR):
+            self._impressao = grafo.impressao_digital()
+            grafo = Grafo.de_csr(grafo)
+        self.grafo = grafo
+        self.tipo = tipo
+        self.cache = cache
+
+        self.ator_para_diretores = defaultdict(set)
+        if tipo == 'diretores':
+            if grafo.vertices and not elencos:
+                raise ValueError("O grafo de diretores precisa dos elencos e diretores já incluídos")
+            for elenco, diretores_filme in zip(elencos, diretores):
+                for ator in elenco:
+                    self.ator_para_diretores[ator].update(diretores_filme)
+
+        self.uf = UniaoBusca(0)
+        self.id_vertice = {}                # nome -> elemento no union-find
+        for u, vizinhos in grafo.lista_adj.items():
+            for v in vizinhos:
+                self._unir(u, v)
+        for v in grafo.vertices:
+            self._id(v)
+
+        self.vertices_desatualizados = set()       # Betweenness/closeness podem ter mudado
+        self.graus_alterados = set()
+        self.centralidades_desatualizadas = []     # Algoritmos descartados do cache
+        self.titulos_adicionados = 0
+
+    def _id(self, nome):
+        i = self.id_vertice.get(nome)
+        if i is None:
+            i = self.id_vertice[nome] = self.uf.adicionar()
+        return i
+
+    def _unir(self, u, v):
+        self.uf.unir(self._id(u), self._id(v))
+
+    def _arestas_novas(self, elencos, diretores):
+        """Gera os pares (u, v) que cada título soma ao grafo, como nos construtores."""
+        for elenco, diretores_filme in zip(elencos, diretores):
+            if self.tipo == 'atores':
+                yield from combinations(sorted(elenco), 2)
+            elif self.tipo == 'direcional':
+                yield from product(elenco, diretores_filme)
+            else:
+                # Cada ator liga seus diretores novos aos que ele já tinha e entre si
+                for ator in elenco:
+                    anteriores = self.ator_para_diretores[ator]
+                    novos = sorted(set(diretores_filme) - anteriores)
+                    for d in novos:
+                        for outro in anteriores:
+                            yield (d, outro) if d <= outro else (outro, d)
+                    yield from combinations(novos, 2)
+                    anteriores.update(novos)
+
+    def adicionar_titulos(self, elencos, diretores):
+        """
+        Soma um lote de títulos ao grafo.
+
+        Args:
+            elencos (list): Lista de elencos (listas de nomes), um por título.
+            diretores (list): Lista de diretores (listas de nomes), um por título.
+
+        Returns:
+            dict: resumo da atualização ('titulos', 'vertices_novos', 'arestas_novas',
+            'graus_alterados', 'vertices_desatualizados', 'centralidades_desatualizadas').
+        """
+        grafo = self.grafo
+        impressao_antiga = None
+        if self.cache is not None:
+            # Os resultados estão em cache sob a forma compacta: a já montada ou,
+            # no primeiro lote, a recebida pelo construtor
+            impressao_antiga = grafo._csr.impressao_digital() if grafo._csr is not None else self._impressao
+
+        elencos = [_padronizar(elenco) for elenco in elencos]
+        diretores = [_padronizar(d) for d in diretores]
+        vertices_antes, arestas_antes = grafo.obter_info()
+
+        tocados = set()
+        for u, v in self._arestas_novas(elencos, diretores):
+            grafo.adicionar_aresta(u, v)
+            self._unir(u, v)
+            tocados.update((u, v))
+        if tocados:
+            self._impressao = None
+
+        # Betweenness e closeness só mudam nas componentes que receberam arestas
+        raizes = {self.uf.encontrar(self.id_vertice[v]) for v in tocados}
+        afetados = {v for v, i in self.id_vertice.items() if self.uf.encontrar(i) in raizes} if raizes else set()
+        self.vertices_desatualizados |= afetados
+        self.graus_alterados |= tocados
+        self.titulos_adicionados += len(elencos)
+
+        descartados = []
+        if impressao_antiga is not None and tocados:
+            descartados = self.cache.descartar_grafo(impressao_antiga)
+            self.centralidades_desatualizadas = sorted(set(self.centralidades_desatualizadas) | set(descartados))
+
+        vertices_depois, arestas_depois = grafo.obter_info()
+        return {
+            'titulos': len(elencos),
+            'vertices_novos': vertices_depois - vertices_antes,
+            'arestas_novas': arestas_depois - arestas_antes,
+            'graus_alterados': len(tocados),
+            'vertices_desatualizados': len(afetados),
+            'centralidades_desatualizadas': descartados,
+        }
+
+    def marcar_atualizado(self):
+        """Esquece as marcações de desatualização (depois de recalcular as centralidades)."""
+        self.vertices_desatualizados.clear()
+        self.graus_alterados.clear()
+        self.centralidades_desatualizadas = []
+
+    # ---------- Consultas ----------
+
+    def mesma_componente(self, u, v):
+        if u not in self.id_vertice or v not in self.id_vertice:
+            return False
+        return self.uf.encontrar(self.id_vertice[u]) == self.uf.encontrar(self.id_vertice[v])
+
+    def componentes(self):
+        """Componentes como listas de nomes, da maior para a menor."""
+        grupos = defaultdict(list)
+        for v, i in self.id_vertice.items():
+            grupos[self.uf.encontrar(i)].append(v)
+        return sorted(grupos.values(), key=len, reverse=True)
+
+    def tamanhos_componentes(self):
+        return [len(c) for c in self.componentes()]
+
+    def centralidade_grau(self, mode="total", normalizar=False):
+        """
+        Mesmo resultado de degree_centrality, lido direto das adjacências (que a
+        atualização já mantém), sem montar a forma compacta.
+        """
+        grafo = self.grafo
+        n = len(grafo.vertices)
+        centralidade = {}
+        for v in grafo.vertices:
+            if grafo.direcionado and mode == "in":
+                grau = grafo.grau_entrada(v)
+            elif grafo.direcionado and mode == "total":
+                grau = grafo.grau_entrada(v) + grafo.grau_saida(v)
+            else:
+                grau = grafo.grau_saida(v)
+            norm = grau / (n - 1) if normalizar and n > 1 else grau
+            centralidade[v] = (grau, norm)
+        return centralidade
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# ========== INSTRUMENTAÇÃO ==========
+#
+# Progresso e métricas dos algoritmos. Os algoritmos chamam as funções deste
+# módulo (progresso, informar, fase, contar, ...), que repassam para a
+# Instrumentacao ativa; outra pode ser instalada com usar().
+
+
+class Instrumentacao:
+    """
+    Coleta fases (tempo de cada etapa), contadores e máximos, e exibe o progresso.
+
+    Args:
+        intervalo (float): Segundos mínimos entre duas linhas de progresso. A
+            última de cada etapa (atual == total) sempre é exibida.
+        silenciosa (bool): Não exibe nada; fases e contadores continuam registrados.
+        ao_progresso (callable, optional): Recebe (rotulo, atual, total), com o mesmo
+            limite de frequência, no lugar da linha no terminal.
+        max_fases (int, optional): Guarda só os últimos max_fases registros de fase
+            (0: nenhum), para processos longos como o servidor; None guarda todos.
+
+    As fases abertas são por thread: fases de threads diferentes não se aninham.
+    """
+    def __init__(self, intervalo=0.2, silenciosa=False, ao_progresso=None, max_fases=None):
+        self.intervalo = intervalo
+        self.silenciosa = silenciosa
+        self.ao_progresso = ao_progresso
+        # [{'fase', 'inicio', 'segundos'}], na ordem de término
+        self.fases = [] if max_fases is None else deque(maxlen=max_fases)
+        self.contadores = defaultdict(int)
+        self.maximos = {}
+        self._inicio = time.perf_counter()
+        self._ultimo_progresso = float('-inf')
+        self._largura_linha = 0
+        self._local = threading.local()      # .abertas: fases em andamento na thread (nomes aninhados)
+
+    # ---------- Saída no terminal ----------
+
+    def progresso(self, rotulo, atual, total):
+        agora = time.perf_counter()
+        if atual < total and agora - self._ultimo_progresso < self.intervalo:
+            return
+        self._ultimo_progresso = agora
+        if self.ao_progresso is not None:
+            self.ao_progresso(rotulo, atual, total)
+        elif not self.silenciosa:
+            texto = f"{rotulo}: {atual}/{total} vértices processados..."
+            print(texto.ljust(self._largura_linha), end='\r', flush=True)
+            self._largura_linha = len(texto)
+
+    def limpar_linha(self):
+        """Apaga a linha de progresso (se houver) antes da próxima mensagem."""
+        if self._largura_linha:
+            print(" " * self._largura_linha, end='\r')
+            self._largura_linha = 0
+        self._ultimo_progresso = float('-inf')
+
+    def informar(self, texto):
+        if not self.silenciosa:
+            self.limpar_linha()
+            print(texto)
+
+    # ---------- Métricas ----------
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede o tempo do bloco; fases dentro de fases ficam como 'externa/interna'."""
+        abertas = self._abertas()
+        abertas.append(nome)
+        caminho = "/".join(abertas)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            abertas.pop()
+            self.fases.append({'fase': caminho, 'inicio': round(inicio - self._inicio, 6),
+                               'segundos': round(fim - inicio, 6)})
+
+    def _abertas(self):
+        abertas = getattr(self._local, 'abertas', None)
+        if abertas is None:
+            abertas = self._local.abertas = []
+        return abertas
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] += quantidade
+
+    def registrar_maximo(self, nome, valor):
+        if valor > self.maximos.get(nome, float('-inf')):
+            self.maximos[nome] = valor
+
+    def perfil(self):
+        """Fases, contadores e máximos coletados até agora, em um dicionário serializável."""
+        tempo_por_fase = defaultdict(float)
+        for registro in self.fases:
+            tempo_por_fase[registro['fase']] += registro['segundos']
+        return {
+            'segundos_total': round(time.perf_counter() - self._inicio, 6),
+            'tempo_por_fase': {fase: round(s, 6) for fase, s in tempo_por_fase.items()},
+            'fases': list(self.fases),
+            'contadores': dict(self.contadores),
+            'maximos': self.maximos,
+        }
+
+    def exportar_json(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.perfil(), f, ensure_ascii=False, indent=2)
+
+
+_ativa = Instrumentacao()
+
+
+def ativa():
+    return _ativa
+
+
+def usar(instrumentacao):
+    """Instala a instrumentação usada pelos algoritmos e retorna a anterior."""
+    global _ativa
+    anterior, _ativa = _ativa, instrumentacao
+    return anterior
+
+
+def progresso(rotulo, atual, total):
+    _ativa.progresso(rotulo, atual, total)
+
+
+def limpar_linha():
+    _ativa.limpar_linha()
+
+
+def informar(texto):
+    _ativa.informar(texto)
+
+
+def fase(nome):
+    return _ativa.fase(nome)
+
+
+def contar(nome, quantidade=1):
+    _ativa.contar(nome, quantidade)
+
+
+def registrar_maximo(nome, valor):
+    _ativa.registrar_maximo(nome, valor)
@@ -1,13 +1,33 @@
+import argparse
+import atexit
 import os
 import platform
+import time
 from collections import defaultdict
-from grafo import carregar_dados_padronizados, construir_grafo_participantes
+from grafo import (
+    TIPOS,
+    carregar_dados_padronizados,
+    construir_grafo_participantes,
+    construir_grafo_direcional,
+    construir_todos_grafos,
+    memoria_grafos
+)
+from cache_grafo import caminho_cache, carregar_ou_construir
+from construcao_externa import construir_externo
+from distribuicoes import distribuicoes, exportar_csv
+from cache_resultados import CacheResultados
+import instrumentacao
 from algoritmos import (
     componentes_conexas,
-    agm_prim,
+    condensacao_scc,
+    distribuicao_ordens,
+    floresta_geradora_minima,
+    agm_da_floresta,
     degree_centrality,
     betweenness_centrality,
-    closeness_centrality
+    betweenness_e_closeness,
+    closeness_top_k,
+    caminho_minimo
 )
 
 # ========== UTILITÁRIOS ==========
@@ -47,35 +67,115 @@ def salvar_agm_completa_em_txt(agm, raiz):
     salvar_em_txt("agm_completa.txt", conteudo)
     print(f"\nÁrvore Geradora Mínima COMPLETA salva em 'resultados/agm_completa.txt'\n")
 
+# ========== CACHE DE RESULTADOS ==========
+
+# Resultados já calculados (em memória e em '.cache_resultados/'), por grafo, algoritmo e parâmetros
+resultados = CacheResultados()
+
+def memorizado(grafo, funcao, **parametros):
+    return resultados.obter(grafo, funcao.__name__, lambda: funcao(grafo, **parametros), **parametros)
+
+# ========== RELATÓRIOS ==========
+
+def texto_informacoes(grafo, tipo_grafo):
+    v, a = grafo.obter_info()
+    conteudo = f"\n--- INFORMAÇÕES BÁSICAS DO GRAFO ---\n"
+    conteudo += f"Grafo de {tipo_grafo}: {v} vértices, {a} arestas\n"
+    return conteudo
+
+def texto_componentes(tipo_grafo, tamanhos, arestas_dag=None):
+    if tipo_grafo == 'direcional':
+        conteudo = f"\n--- COMPONENTES FORTEMENTE CONEXAS ---\n"
+        conteudo += f"Grafo de {tipo_grafo}: {len(tamanhos)} componentes fortemente conexas\n"
+        conteudo += f"Arestas no DAG de condensação: {len(arestas_dag)}\n"
+    else:
+        conteudo = f"\n--- COMPONENTES CONEXAS ---\n"
+        conteudo += f"Grafo de {tipo_grafo}: {len(tamanhos)} componentes conexas\n"
+    conteudo += "Distribuição da ordem das componentes (ordem: quantidade):\n"
+    for ordem, quantidade in distribuicao_ordens(tamanhos):
+        conteudo += f"{ordem}: {quantidade}\n"
+    return conteudo
+
+def texto_grau(grafo, tipo_grafo):
+    conteudo = f"\n--- CENTRALIDADE DE GRAU - {tipo_grafo.upper()} ---\n"
+    if tipo_grafo == 'direcional':
+        graus_in = memorizado(grafo, degree_centrality, mode="in", normalizar=True)
+        graus_out = memorizado(grafo, degree_centrality, mode="out", normalizar=True)
+        conteudo += "Top 10 por grau de entrada (in):\n"
+        for v, (g, norm) in sorted(graus_in.items(), key=lambda x: -x[1][0])[:10]:
+            conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
+        conteudo += "\nTop 10 por grau de saída (out):\n"
+        for v, (g, norm) in sorted(graus_out.items(), key=lambda x: -x[1][0])[:10]:
+            conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
+    else:
+        graus = memorizado(grafo, degree_centrality, normalizar=True)
+        for v, (g, norm) in sorted(graus.items(), key=lambda x: -x[1][0])[:10]:
+            conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
+    return conteudo
+
+def texto_top10(titulo, centralidade):
+    conteudo = f"\n--- {titulo} ---\n"
+    for v, (c, norm) in sorted(centralidade.items(), key=lambda x: -x[1][0])[:10]:
+        conteudo += f"{v}: {c:.4f} (normalizado: {norm:.4f})\n"
+    return conteudo
+
+def texto_distribuicoes(grafo, tipo_grafo):
+    resultado = distribuicoes(grafo)
+    arquivos = exportar_csv(resultado, "resultados", f"distribuicoes_{tipo_grafo}")
+    conteudo = f"\n--- DISTRIBUIÇÕES DE GRAU, FORÇA E COMPONENTES - {tipo_grafo.upper()} ---\n"
+    for nome, dist in resultado.items():
+        conteudo += f"{nome}: {dist['n']} valores, média {dist['media']:.2f}, máximo {dist['maximo']}\n"
+        ajuste = dist['lei_potencia']
+        if ajuste is None:
+            conteudo += "  lei de potência: cauda insuficiente para o ajuste\n"
+        else:
+            conteudo += (f"  lei de potência: alfa = {ajuste['alfa']:.3f} ± {ajuste['erro']:.3f} "
+                         f"(xmin = {ajuste['xmin']}, {ajuste['n_cauda']} na cauda, KS = {ajuste['ks']:.4f})\n")
+    conteudo += f"Histogramas, CCDFs e ajustes gravados em {len(arquivos)} arquivos CSV em 'resultados/'.\n"
+    return conteudo
+
+def texto_memoria(relatorio):
+    conteudo = "\n--- MEMÓRIA DOS GRAFOS (MB) ---\n"
+    for nome, partes in relatorio.items():
+        detalhes = ", ".join(f"{parte}: {valor / 2**20:.2f}" for parte, valor in partes.items() if parte != 'total')
+        conteudo += f"{nome}: {partes['total'] / 2**20:.2f} ({detalhes})\n"
+    return conteudo
+
 # ========== MENU E EXECUÇÃO DE OPÇÕES ==========
 
 def mostrar_menu(tipo_grafo):
     print("""
 ===== ANÁLISE DE REDES COMPLEXAS =====
 1. Informações básicas do grafo
-2. Componentes conexas
-""" + ("3. Árvore Geradora Mínima (apenas para atores)\n" if tipo_grafo == 'atores' else "") +
+""" + ("2. Componentes fortemente conexas\n" if tipo_grafo == 'direcional' else "2. Componentes conexas\n") +
+    ("3. Árvore Geradora Mínima (apenas para atores)\n" if tipo_grafo == 'atores' else "") +
     ("4. Centralidade de Grau\n" if tipo_grafo != 'direcional' else "4. Centralidade de Grau (in/out)\n") +
-    "3. Centralidade de Intermediação\n" +
+    "5. Centralidade de Intermediação\n" +
     "6. Centralidade de Proximidade\n" +
+    "7. Caminho mínimo entre dois vértices\n" +
+    "8. Distribuições de grau, força e componentes (CSV)\n" +
     "0. Sair\n======================================\n")
     return input("Escolha uma opção: ").strip()
 
 def executar_opcao(opcao, grafo, tipo_grafo):
+    with instrumentacao.fase(f"opcao_{opcao}"):
+        _executar_opcao(opcao, grafo, tipo_grafo)
+
+def _executar_opcao(opcao, grafo, tipo_grafo):
     conteudo = ""
 
     if opcao == "1":
-        v, a = grafo.obter_info()
-        conteudo += f"\n--- INFORMAÇÕES BÁSICAS DO GRAFO ---\n"
-        conteudo += f"Grafo de {tipo_grafo}: {v} vértices, {a} arestas\n"
+        conteudo += texto_informacoes(grafo, tipo_grafo)
 
     elif opcao == "2":
-        comp = componentes_conexas(grafo)
-        conteudo += f"\n--- COMPONENTES CONEXAS ---\n"
-        conteudo += f"Grafo de {tipo_grafo}: {len(comp)} componentes conexas\n"
+        if tipo_grafo == 'direcional':
+            _, tamanhos, arestas_dag = memorizado(grafo, condensacao_scc)
+            conteudo += texto_componentes(tipo_grafo, tamanhos, arestas_dag)
+        else:
+            conteudo += texto_componentes(tipo_grafo, [len(c) for c in memorizado(grafo, componentes_conexas)])
 
     elif opcao == "3" and tipo_grafo == 'atores':
-        conteudo += "\n--- ÁRVORE GERADORA MÍNIMA (PRIM) ---\n"
+        conteudo += "\n--- ÁRVORE GERADORA MÍNIMA (KRUSKAL) ---\n"
         print("1 - Informar vértice manualmente")
         print("2 - Escolher automaticamente o primeiro vértice disponível")
         escolha = input("Opção (1 ou 2): ").strip()
@@ -101,7 +201,8 @@ def executar_opcao(opcao, grafo, tipo_grafo):
             salvar_em_txt("saida_opcao_3.txt", conteudo)
             return
 
-        agm, custo = agm_prim(grafo, raiz)
+        # A floresta é calculada uma vez; cada raiz é só uma consulta à sua componente
+        agm, custo = agm_da_floresta(memorizado(grafo, floresta_geradora_minima), raiz)
         if not agm:
             conteudo += "Não foi possível gerar a AGM. Verifique se o grafo é conexo.\n"
         else:
@@ -109,46 +210,50 @@ def executar_opcao(opcao, grafo, tipo_grafo):
             salvar_agm_completa_em_txt(agm, raiz)
 
     elif opcao == "4":
-        conteudo += f"\n--- CENTRALIDADE DE GRAU - {tipo_grafo.upper()} ---\n"
-        if tipo_grafo == 'direcional':
-            graus_in = degree_centrality(grafo, mode="in", normalizar=True)
-            graus_out = degree_centrality(grafo, mode="out", normalizar=True)
-            conteudo += "Top 10 por grau de entrada (in):\n"
-            for v, (g, norm) in sorted(graus_in.items(), key=lambda x: -x[1][0])[:10]:
-                conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
-            conteudo += "\nTop 10 por grau de saída (out):\n"
-            for v, (g, norm) in sorted(graus_out.items(), key=lambda x: -x[1][0])[:10]:
-                conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
-        else:
-            graus = degree_centrality(grafo, normalizar=True)
-            for v, (g, norm) in sorted(graus.items(), key=lambda x: -x[1][0])[:10]:
-                conteudo += f"{v}: {g} (normalizado: {norm:.4f})\n"
+        conteudo += texto_grau(grafo, tipo_grafo)
 
     elif opcao == "5":
-        conteudo += f"\n--- CENTRALIDADE DE INTERMEDIAÇÃO - {tipo_grafo.upper()} ---\n"
-        centralidade = betweenness_centrality(grafo, normalizar=True)
-        for v, (c, norm) in sorted(centralidade.items(), key=lambda x: -x[1][0])[:10]:
-            conteudo += f"{v}: {c:.4f} (normalizado: {norm:.4f})\n"
+        centralidade = resultados.obter(
+            grafo, 'betweenness_centrality',
+            lambda: betweenness_centrality(grafo, normalizar=True, workers=os.cpu_count()),
+            normalizar=True)
+        conteudo += texto_top10(f"CENTRALIDADE DE INTERMEDIAÇÃO - {tipo_grafo.upper()}", centralidade)
 
     elif opcao == "6":
-        print(f"\n--- CENTRALIDADE DE PROXIMIDADE (CLOSENESS) - {tipo_grafo.upper()} ---")
-        componentes = componentes_conexas(grafo)
-        maior_componente = max(componentes, key=len)
-        centralidade = closeness_centrality(grafo, vertices=maior_componente)
-        print("Top 10 vértices por proximidade:")
-        def get_val(x):
-            if isinstance(x, tuple):
-                return x[0]
-            return x
-        top10 = sorted(centralidade.items(), key=lambda x: -get_val(x[1]))[:10]
-        for v, c in top10:
-            if isinstance(c, tuple):
-                if len(c) > 1:
-                    print(f"{v}: {c[0]:.4f} (normalizado: {c[1]:.4f})")
-                else:
-                    print(f"{v}: {c[0]:.4f}")
+        # Só os 10 primeiros são mostrados: a busca top-k poda as BFS que não podem entrar
+        def calcular():
+            maior_componente = max(memorizado(grafo, componentes_conexas), key=len)
+            return closeness_top_k(grafo, k=10, normalizar=True, vertices=maior_componente)
+
+        centralidade = resultados.obter(grafo, 'closeness_top_k', calcular,
+                                        k=10, normalizar=True, vertices='maior_componente')
+        conteudo += texto_top10(f"CENTRALIDADE DE PROXIMIDADE (CLOSENESS) - {tipo_grafo.upper()}", centralidade)
+
+    elif opcao == "7":
+        origem = input("Vértice de origem: ").strip().upper()
+        destino = input("Vértice de destino: ").strip().upper()
+        print("1 - Menor número de ligações (BFS bidirecional)")
+        print("2 - Ponderado pelas colaborações, custo 1/peso (Dijkstra bidirecional)")
+        ponderado = input("Opção (1 ou 2): ").strip() == "2"
+
+        conteudo += f"\n--- CAMINHO MÍNIMO: {origem} -> {destino} ---\n"
+        faltando = [v for v in (origem, destino) if v not in grafo.vertices]
+        if faltando:
+            conteudo += "".join(f"Vértice '{v}' não encontrado.\n" for v in faltando)
+        else:
+            inicio = time.perf_counter()
+            caminho, distancia, visitados = caminho_minimo(grafo, origem, destino, ponderado)
+            decorrido = (time.perf_counter() - inicio) * 1000
+            if not caminho:
+                conteudo += "Não há caminho entre os vértices.\n"
             else:
-                print(f"{v}: {c:.4f}")
+                conteudo += " -> ".join(caminho) + "\n"
+                conteudo += (f"Custo (soma de 1/peso): {distancia:.4f}\n" if ponderado
+                             else f"Distância: {distancia} ligações\n")
+            conteudo += f"Vértices visitados: {visitados} de {len(grafo.vertices)} ({decorrido:.2f} ms)\n"
+
+    elif opcao == "8":
+        conteudo += texto_distribuicoes(grafo, tipo_grafo)
 
     elif opcao == "0":
         print("Saindo do programa... Até mais!")
@@ -161,18 +266,141 @@ def executar_opcao(opcao, grafo, tipo_grafo):
     if conteudo:
         print(conteudo)
         salvar_em_txt(f"saida_opcao_{opcao}.txt", conteudo)
+        print(resultados)
+
+# ========== EXECUÇÃO EM LOTE ==========
+
+def construir_grafo(tipo_grafo, elencos, diretores):
+    if tipo_grafo == 'direcional':
+        return construir_grafo_direcional(elencos, diretores)
+    return construir_grafo_participantes(elencos, diretores, tipo=tipo_grafo)
+
+def executar_lote(arquivo_csv, tipos, workers=None, reducao=False, memoria_mb=None):
+    """
+    Calcula todos os relatórios de cada tipo de grafo sem interação e grava
+    resultados/saida_opcao_<n>_<tipo>.txt. Cada grafo é lido do cache ou, se
+    faltar algum, os três são construídos juntos em uma única leitura do CSV
+    (construir_todos_grafos). As componentes são
+    reaproveitadas e betweenness e closeness compartilham a BFS de cada fonte;
+    com `reducao`, os grafos não direcionados as calculam por blocos biconexos.
+    Com `memoria_mb`, cada grafo fora do cache é construído separadamente pela
+    construção externa (construir_externo), dentro desse orçamento de memória e
+    gravado direto no arquivo do cache, que é aberto mapeado em memória.
+    """
+    construidos = {}
+
+    def construir_todos():
+        # No primeiro grafo fora do cache, lê o CSV e constrói os três de uma vez
+        if not construidos:
+            print("Carregando dados do arquivo...")
+            with instrumentacao.fase("carregar"):
+                elencos, diretores = carregar_dados_padronizados(arquivo_csv)
+            with instrumentacao.fase("construir"):
+                grafos, tabela = construir_todos_grafos(elencos, diretores)
+            construidos.update(grafos)
+            print(texto_memoria(memoria_grafos(grafos, tabela)))
+        return construidos
+
+    def construir(tipo_grafo):
+        if memoria_mb is not None:
+            with instrumentacao.fase("construir"):
+                return construir_externo(arquivo_csv, tipo_grafo, memoria_mb,
+                                         caminho_saida=caminho_cache(arquivo_csv, tipo_grafo))
+        return construir_todos()[tipo_grafo]
+
+    for tipo_grafo in tipos:
+        print(f"\n===== {tipo_grafo.upper()} =====")
+        with instrumentacao.fase(tipo_grafo):
+            relatorios = _relatorios_lote(arquivo_csv, tipo_grafo, construir, workers, reducao)
+        for opcao, conteudo in relatorios.items():
+            salvar_em_txt(f"saida_opcao_{opcao}_{tipo_grafo}.txt", conteudo)
+        print(f"Relatórios de {tipo_grafo} gravados em 'resultados/'.")
+    print(resultados)
+
+def _relatorios_lote(arquivo_csv, tipo_grafo, construir, workers, reducao=False):
+    """Texto de cada opção do menu (chaves "1" a "6" e "8") para um tipo de grafo."""
+    grafo = carregar_ou_construir(arquivo_csv, tipo_grafo, lambda: construir(tipo_grafo))
+    relatorios = {"1": texto_informacoes(grafo, tipo_grafo)}
+
+    componentes = memorizado(grafo, componentes_conexas)
+    if tipo_grafo == 'direcional':
+        _, tamanhos, arestas_dag = memorizado(grafo, condensacao_scc)
+        relatorios["2"] = texto_componentes(tipo_grafo, tamanhos, arestas_dag)
+    else:
+        relatorios["2"] = texto_componentes(tipo_grafo, [len(c) for c in componentes])
+
+    if tipo_grafo == 'atores' and grafo.vertices:
+        raiz = next(iter(grafo.vertices))
+        floresta = memorizado(grafo, floresta_geradora_minima)
+        _, custo = agm_da_floresta(floresta, raiz)
+        _, custos, _ = floresta
+        relatorios["3"] = ("\n--- ÁRVORE GERADORA MÍNIMA (KRUSKAL) ---\n"
+                           f"Raiz escolhida automaticamente: {raiz}\n"
+                           f"\nCusto total da AGM: {custo}\n"
+                           f"Floresta geradora mínima: {len(custos)} componentes, custo total {sum(custos)}\n")
+
+    relatorios["4"] = texto_grau(grafo, tipo_grafo)
+
+    betweenness, closeness = resultados.obter(
+        grafo, 'betweenness_e_closeness',
+        lambda: betweenness_e_closeness(grafo, normalizar=True, workers=workers, reducao=reducao),
+        normalizar=True, reducao=reducao)
+    relatorios["5"] = texto_top10(f"CENTRALIDADE DE INTERMEDIAÇÃO - {tipo_grafo.upper()}", betweenness)
+    maior_componente = max(componentes, key=len) if componentes else []
+    relatorios["6"] = texto_top10(f"CENTRALIDADE DE PROXIMIDADE (CLOSENESS) - {tipo_grafo.upper()}",
+                                  {v: closeness[v] for v in maior_componente})
+    relatorios["8"] = texto_distribuicoes(grafo, tipo_grafo)
+
+    return relatorios
 
 # ========== MAIN ==========
 
+def ler_tipos(parser, texto):
+    """Tipos de grafo de `texto`, separados por vírgula; qualquer tipo fora de TIPOS é erro do parser."""
+    tipos = [t.strip() for t in texto.split(",") if t.strip()]
+    invalidos = [t for t in tipos if t not in TIPOS]
+    if invalidos:
+        parser.error(f"tipo de grafo inválido: {', '.join(invalidos)}")
+    return tipos
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Análise de redes complexas (Netflix, Amazon, Disney+).")
+    parser.add_argument("--all", action="store_true",
+                        help="Calcula todos os relatórios sem menu interativo e encerra.")
+    parser.add_argument("--graph", default=",".join(TIPOS),
+                        help=f"Grafos para o modo --all, separados por vírgula ({', '.join(TIPOS)}).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processos para betweenness/closeness no modo --all (padrão: todos os núcleos).")
+    parser.add_argument("--blocos", action="store_true",
+                        help="No modo --all, calcula betweenness/closeness dos grafos não direcionados "
+                             "por blocos biconexos (mesmo resultado, menos BFS quando há muitas pontes).")
+    parser.add_argument("--memoria-mb", type=int, default=None,
+                        help="Constrói os grafos fora do cache lendo o CSV em blocos, com os pares ordenados "
+                             "em disco, dentro deste orçamento de memória (catálogos maiores que a RAM).")
+    parser.add_argument("--perfil", metavar="ARQUIVO",
+                        help="Grava ao final um perfil JSON com o tempo de cada fase e os contadores dos algoritmos.")
+    parser.add_argument("--silencioso", action="store_true",
+                        help="Não exibe o progresso nem as mensagens dos algoritmos.")
+    args = parser.parse_args()
+    args.graph = ler_tipos(parser, args.graph)
+    return args
+
 def main():
+    args = ler_argumentos()
     arquivo_csv = 'netflix_amazon_disney_titles.csv'
 
     if not os.path.exists(arquivo_csv):
         print(f"ERRO: O arquivo '{arquivo_csv}' não foi encontrado na pasta atual.")
         return
 
-    print("Carregando dados do arquivo...")
-    elencos, diretores = carregar_dados_padronizados(arquivo_csv)
+    instrumentacao.usar(instrumentacao.Instrumentacao(silenciosa=args.silencioso))
+    if args.perfil:
+        atexit.register(instrumentacao.ativa().exportar_json, args.perfil)
+
+    if args.all:
+        executar_lote(arquivo_csv, args.graph, workers=args.workers, reducao=args.blocos,
+                      memoria_mb=args.memoria_mb)
+        return
 
     print("Escolha o tipo de grafo para análise:")
     print("1 - Grafo de atores (não direcionado)")
@@ -180,19 +408,25 @@ def main():
     print("3 - Grafo direcionado (atores → diretores)")
     escolha = input("Opção (1, 2 ou 3): ").strip()
 
-    if escolha == "1":
-        tipo_grafo = 'atores'
-        grafo = construir_grafo_participantes(elencos, diretores, tipo=tipo_grafo)
-    elif escolha == "2":
-        tipo_grafo = 'diretores'
-        grafo = construir_grafo_participantes(elencos, diretores, tipo=tipo_grafo)
-    elif escolha == "3":
-        tipo_grafo = 'direcional'
-        from grafo import construir_grafo_direcional
-        grafo = construir_grafo_direcional(elencos, diretores)
-    else:
+    tipos = {"1": 'atores', "2": 'diretores', "3": 'direcional'}
+    if escolha not in tipos:
         print("Opção inválida. Encerrando.")
         return
+    tipo_grafo = tipos[escolha]
+
+    def construir():
+        if args.memoria_mb is not None:
+            with instrumentacao.fase("construir"):
+                return construir_externo(arquivo_csv, tipo_grafo, args.memoria_mb,
+                                         caminho_saida=caminho_cache(arquivo_csv, tipo_grafo))
+        print("Carregando dados do arquivo...")
+        with instrumentacao.fase("carregar"):
+            elencos, diretores = carregar_dados_padronizados(arquivo_csv)
+        with instrumentacao.fase("construir"):
+            return construir_grafo(tipo_grafo, elencos, diretores)
+
+    # Usa o grafo salvo em disco se o CSV não mudou desde a última construção
+    grafo = carregar_ou_construir(arquivo_csv, tipo_grafo, construir)
 
     print(f"Grafo de {tipo_grafo} criado com sucesso!")
 
@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from grafo import TIPOS, carregar_dados_padronizados, construir_todos_grafos
+from cache_grafo import abrir_csr, caminho_cache, carregar_ou_construir
+from cache_resultados import CacheResultados
+import instrumentacao
+from main import ler_tipos
+from algoritmos import (
+    componentes_conexas,
+    condensacao_scc,
+    distribuicao_ordens,
+    floresta_geradora_minima,
+    agm_da_floresta,
+    degree_centrality,
+    betweenness_centrality,
+    closeness_top_k,
+    caminho_minimo
+)
+
+# ========== SERVIÇO DE CONSULTAS ==========
+#
+# Servidor HTTP local que carrega os grafos uma vez (do cache .csr, mapeado em
+# memória) e responde consultas em JSON. Consultas a um vértice são respondidas
+# na própria thread da requisição; cálculos sobre o grafo inteiro vão para um
+# pool de processos e o resultado fica guardado para as próximas requisições.
+
+# Grafos de cada processo trabalhador, abertos dos arquivos de cache na inicialização
+_grafos_trabalhador = {}
+_resultados_trabalhador = None
+
+
+def _iniciar_trabalhador(caminhos):
+    global _resultados_trabalhador
+    instrumentacao.usar(instrumentacao.Instrumentacao(silenciosa=True))
+    for tipo, caminho in caminhos.items():
+        _grafos_trabalhador[tipo] = abrir_csr(caminho)
+    _resultados_trabalhador = CacheResultados()
+
+
+def _componentes(grafo):
+    """{'rotulos': nome -> componente, 'tamanhos': [...]}; no grafo direcionado, as fortemente conexas."""
+    if grafo.direcionado:
+        rotulos, tamanhos, _ = condensacao_scc(grafo)
+        return {'rotulos': rotulos, 'tamanhos': tamanhos}
+    rotulos, tamanhos = {}, []
+    for c, componente in enumerate(componentes_conexas(grafo)):
+        tamanhos.append(len(componente))
+        for v in componente:
+            rotulos[v] = c
+    return {'rotulos': rotulos, 'tamanhos': tamanhos}
+
+
+def _closeness_maior_componente(grafo, k):
+    # Como na opção 6 do menu: só os vértices da maior componente
+    maior_componente = max(componentes_conexas(grafo), key=len) if grafo.n else []
+    return closeness_top_k(grafo, k=k, normalizar=True, vertices=maior_componente)
+
+
+# Cálculos pesados: nome -> função(grafo, **parametros)
+CALCULOS = {
+    'componentes': _componentes,
+    'floresta': floresta_geradora_minima,
+    'grau': lambda grafo: degree_centrality(grafo, normalizar=True),
+    'betweenness': lambda grafo: betweenness_centrality(grafo, normalizar=True),
+    'closeness': _closeness_maior_componente,
+}
+
+
+def _calcular(tipo, calculo, parametros):
+    """Executado no trabalhador; usa (e grava) o cache de resultados em disco."""
+    grafo = _grafos_trabalhador[tipo]
+    return _resultados_trabalhador.obter(grafo, f"servidor_{calculo}",
+                                         lambda: CALCULOS[calculo](grafo, **parametros), **parametros)
+
+
+class ErroConsulta(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class ServicoGrafos:
+    """
+    Grafos carregados (somente leitura) e o pool de processos dos cálculos pesados.
+    Requisições iguais e simultâneas esperam pelo mesmo cálculo.
+    """
+    def __init__(self, arquivo_csv, tipos, workers=None):
+        self.grafos = {}
+        construidos = {}
+
+        def construir_todos():
+            if not construidos:
+                elencos, diretores = carregar_dados_padronizados(arquivo_csv)
+                construidos.update(construir_todos_grafos(elencos, diretores)[0])
+            return construidos
+
+        for tipo in tipos:
+            self.grafos[tipo] = carregar_ou_construir(arquivo_csv, tipo, lambda: construir_todos()[tipo])
+        caminhos = {tipo: caminho_cache(arquivo_csv, tipo) for tipo in tipos}
+
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_trabalhador,
+                                            initargs=(caminhos,))
+        self._futuros = {}
+        self._trava = threading.Lock()
+
+    def calcular(self, tipo, calculo, **parametros):
+        chave = (tipo, calculo, tuple(sorted(parametros.items())))
+        with self._trava:
+            futuro = self._futuros.get(chave)
+            if futuro is None or (futuro.done() and futuro.exception() is not None):
+                futuro = self._futuros[chave] = self.executor.submit(_calcular, tipo, calculo, parametros)
+        return futuro.result()
+
+    def encerrar(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    # ---------- Consultas ----------
+
+    def grafo(self, consulta):
+        tipo = consulta.get('grafo', next(iter(self.grafos)))
+        if tipo not in self.grafos:
+            raise ErroConsulta(404, f"grafo '{tipo}' não carregado (disponíveis: {', '.join(self.grafos)})")
+        return tipo, self.grafos[tipo]
+
+    @staticmethod
+    def vertice(grafo, consulta, parametro='nome'):
+        nome = consulta.get(parametro, '').strip().upper()
+        if not nome:
+            raise ErroConsulta(400, f"informe o parâmetro '{parametro}'")
+        if nome not in grafo.indice:
+            raise ErroConsulta(404, f"vértice '{nome}' não encontrado")
+        return nome
+
+    @staticmethod
+    def inteiro(consulta, parametro, padrao):
+        try:
+            valor = int(consulta.get(parametro, padrao))
+        except ValueError:
+            raise ErroConsulta(400, f"'{parametro}' deve ser um inteiro")
+        if valor < 1:
+            raise ErroConsulta(400, f"'{parametro}' deve ser positivo")
+        return valor
+
+    @staticmethod
+    def grau_entrada(grafo, i):
+        # A transposta é montada uma vez por grafo e reaproveitada
+        indptr = grafo.transposta().indptr
+        return indptr[i + 1] - indptr[i]
+
+    def info(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        vertices, arestas = grafo.obter_info()
+        return {'grafo': tipo, 'direcionado': grafo.direcionado, 'vertices': vertices, 'arestas': arestas}
+
+    def consultar_vertice(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        nome = self.vertice(grafo, consulta)
+        i = grafo.indice[nome]
+        inicio, fim = grafo.indptr[i], grafo.indptr[i + 1]
+        resposta = {'grafo': tipo, 'nome': nome, 'grau_saida' if grafo.direcionado else 'grau': fim - inicio,
+                    'forca': sum(grafo.pesos[inicio:fim])}
+        if grafo.direcionado:
+            resposta['grau_entrada'] = self.grau_entrada(grafo, i)
+        return resposta
+
+    def grau(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        nome = self.vertice(grafo, consulta)
+        n = grafo.n
+        resposta = {'grafo': tipo, 'nome': nome}
+        graus = {'saida': grafo.grau(grafo.indice[nome])}
+        if grafo.direcionado:
+            graus['entrada'] = self.grau_entrada(grafo, grafo.indice[nome])
+            graus['total'] = graus['entrada'] + graus['saida']
+        else:
+            graus = {'total': graus['saida']}
+        for modo, valor in graus.items():
+            resposta[modo] = {'grau': valor, 'normalizado': valor / (n - 1) if n > 1 else valor}
+        return resposta
+
+    def agm(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        if grafo.direcionado:
+            raise ErroConsulta(400, "a árvore geradora mínima é definida para grafos não direcionados")
+        raiz = self.vertice(grafo, consulta, 'raiz')
+        arestas, custo = agm_da_floresta(self.calcular(tipo, 'floresta'), raiz)
+        return {'grafo': tipo, 'raiz': raiz, 'custo': custo, 'arestas': len(arestas)}
+
+    def componente(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        componentes = self.calcular(tipo, 'componentes')
+        if 'nome' not in consulta:
+            return {'grafo': tipo, 'componentes': len(componentes['tamanhos']),
+                    'distribuicao': distribuicao_ordens(componentes['tamanhos'])}
+        nome = self.vertice(grafo, consulta)
+        c = componentes['rotulos'][nome]
+        resposta = {'grafo': tipo, 'nome': nome, 'componente': c, 'tamanho': componentes['tamanhos'][c]}
+        if 'outro' in consulta:
+            outro = self.vertice(grafo, consulta, 'outro')
+            resposta['mesma_componente'] = componentes['rotulos'][outro] == c
+        return resposta
+
+    def centralidade(self, consulta):
+        tipo, _ = self.grafo(consulta)
+        medida = consulta.get('medida', 'grau')
+        k = self.inteiro(consulta, 'k', 10)
+        if medida == 'closeness':
+            resultado = self.calcular(tipo, 'closeness', k=k)
+        elif medida in ('grau', 'betweenness'):
+            resultado = self.calcular(tipo, medida)
+        else:
+            raise ErroConsulta(400, "medida deve ser 'grau', 'betweenness' ou 'closeness'")
+        top = sorted(resultado.items(), key=lambda x: -x[1][0])[:k]
+        return {'grafo': tipo, 'medida': medida,
+                'top': [{'nome': v, 'valor': valor, 'normalizado': norm} for v, (valor, norm) in top]}
+
+    def caminho(self, consulta):
+        tipo, grafo = self.grafo(consulta)
+        origem = self.vertice(grafo, consulta, 'origem')
+        destino = self.vertice(grafo, consulta, 'destino')
+        ponderado = consulta.get('ponderado', '0') not in ('0', 'false', '')
+        caminho, distancia, visitados = caminho_minimo(grafo, origem, destino, ponderado)
+        return {'grafo': tipo, 'origem': origem, 'destino': destino, 'ponderado': ponderado,
+                'caminho': caminho, 'distancia': distancia if caminho else None, 'visitados': visitados}
+
+
+ROTAS = {
+    '/info': ServicoGrafos.info,
+    '/vertice': ServicoGrafos.consultar_vertice,
+    '/grau': ServicoGrafos.grau,
+    '/agm': ServicoGrafos.agm,
+    '/componente': ServicoGrafos.componente,
+    '/centralidade': ServicoGrafos.centralidade,
+    '/caminho': ServicoGrafos.caminho,
+}
+
+
+class ManipuladorConsultas(BaseHTTPRequestHandler):
+    servico = None                          # ServicoGrafos, definido em servir()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        rota = ROTAS.get(url.path.rstrip('/') or '/')
+        try:
+            if rota is None:
+                raise ErroConsulta(404, f"rota desconhecida (disponíveis: {', '.join(ROTAS)})")
+            status, resposta = 200, rota(self.servico, consulta)
+        except ErroConsulta as e:
+            status, resposta = e.status, {'erro': str(e)}
+        except Exception as e:
+            status, resposta = 500, {'erro': f"{type(e).__name__}: {e}"}
+
+        corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+def servir(arquivo_csv, tipos, porta=8000, workers=None):
+    servico = ServicoGrafos(arquivo_csv, tipos, workers)
+    ManipuladorConsultas.servico = servico
+    # As consultas rodam nas threads das requisições: sem saída no terminal e sem
+    # acumular um registro de fase por consulta enquanto o servidor estiver no ar
+    instrumentacao.usar(instrumentacao.Instrumentacao(silenciosa=True, max_fases=0))
+    # Só na interface local: o serviço não tem autenticação
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta), ManipuladorConsultas)
+    print(f"Servindo {', '.join(tipos)} em http://127.0.0.1:{servidor.server_port} "
+          f"(rotas: {', '.join(ROTAS)}). Ctrl+C para encerrar.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando...")
+    finally:
+        servidor.server_close()
+        servico.encerrar()
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de consultas aos grafos.")
+    parser.add_argument("--csv", default="netflix_amazon_disney_titles.csv", help="Arquivo CSV dos títulos.")
+    parser.add_argument("--graph", default=",".join(TIPOS),
+                        help=f"Grafos carregados, separados por vírgula ({', '.join(TIPOS)}).")
+    parser.add_argument("--porta", type=int, default=8000, help="Porta em 127.0.0.1 (padrão: 8000).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processos para os cálculos pesados (padrão: todos os núcleos).")
+    args = parser.parse_args()
+    args.graph = ler_tipos(parser, args.graph)
+    return args
+
+
+if __name__ == "__main__":
+    args = ler_argumentos()
+    if not os.path.exists(args.csv):
+        print(f"ERRO: O arquivo '{args.csv}' não foi encontrado.")
+    else:
+        servir(args.csv, args.graph, args.porta, args.workers)